@@ -0,0 +1,99 @@
+"""
+Benchmark of loading rows with UppercaseCharField and NullCharField.
+
+Loads the same rows through a model using Oscar's fields and through one
+using equivalent fields built on SubfieldBase, as the fields used to be,
+from an in-memory SQLite database.
+
+Usage: python benchmarks/char_fields_benchmark.py [number of rows]
+"""
+import sys
+import time
+import warnings
+
+from django.conf import settings
+
+settings.configure(
+    DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3',
+                           'NAME': ':memory:'}},
+    INSTALLED_APPS=[],
+)
+
+import django  # NOQA
+django.setup()
+
+from django.db import connection, models  # NOQA
+from django.utils import six  # NOQA
+
+from oscar.models.fields import NullCharField, UppercaseCharField  # NOQA
+
+warnings.simplefilter('ignore')
+
+
+class LegacyUppercaseCharField(six.with_metaclass(
+        models.SubfieldBase, models.CharField)):
+
+    def to_python(self, value):
+        val = super(LegacyUppercaseCharField, self).to_python(value)
+        if isinstance(val, six.string_types):
+            return val.upper()
+        return val
+
+
+class LegacyNullCharField(six.with_metaclass(
+        models.SubfieldBase, models.CharField)):
+
+    def to_python(self, value):
+        val = super(LegacyNullCharField, self).to_python(value)
+        return val if val is not None else u''
+
+    def get_prep_value(self, value):
+        prepped = super(LegacyNullCharField, self).get_prep_value(value)
+        return prepped if prepped != u"" else None
+
+
+class Row(models.Model):
+    postcode = UppercaseCharField(max_length=64)
+    code = NullCharField(max_length=64)
+
+    class Meta:
+        app_label = 'benchmarks'
+
+
+class LegacyRow(models.Model):
+    postcode = LegacyUppercaseCharField(max_length=64)
+    code = LegacyNullCharField(max_length=64, null=True, blank=True)
+
+    class Meta:
+        app_label = 'benchmarks'
+
+
+def load(model):
+    start = time.time()
+    rows = list(model.objects.order_by('pk'))
+    return time.time() - start, rows
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with connection.schema_editor() as editor:
+        editor.create_model(Row)
+        editor.create_model(LegacyRow)
+    for model in (Row, LegacyRow):
+        model.objects.bulk_create(
+            model(postcode='ab%d cd' % i, code=None if i % 2 else str(i))
+            for i in range(count))
+
+    legacy_time, legacy_rows = load(LegacyRow)
+    current_time, rows = load(Row)
+    mismatches = sum(
+        1 for a, b in zip(legacy_rows, rows)
+        if (a.postcode, a.code) != (b.postcode, b.code))
+    print("%d rows" % count)
+    print("SubfieldBase: %.2fs" % legacy_time)
+    print("current:      %.2fs" % current_time)
+    print("mismatches: %d" % mismatches)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark of oscar.core.utils.slugify over product titles.
+
+Compares the cached slugify pipeline with the previous implementation,
+which re-read the settings and applied the slug map and blacklist with one
+str.replace per entry, and checks that both produce the same slugs.
+
+Usage: python benchmarks/slugify_benchmark.py [number of titles]
+"""
+import random
+import sys
+import time
+
+from django.conf import settings
+
+settings.configure(
+    OSCAR_SLUG_FUNCTION='oscar.core.utils.default_slugifier',
+    OSCAR_SLUG_MAP={'c++': 'cpp', 'f#': 'fsharp', '&': 'and'},
+    OSCAR_SLUG_BLACKLIST=['the', 'a', 'an', 'of'],
+)
+
+import django  # NOQA
+django.setup()
+
+from django.utils import six  # NOQA
+from unidecode import unidecode  # NOQA
+
+from oscar.core.loading import import_string  # NOQA
+from oscar.core.utils import slugify  # NOQA
+
+WORDS = [
+    u'the', u'a', u'of', u'book', u'c++', u'f#', u'guide', u'deluxe',
+    u'caf\xe9', u'na\xefve', u'edition', u'2nd', u'red', u'blue', u'&',
+    u'shoes', u'журнал', u'box', u'set',
+]
+
+
+def previous_slugify(value):
+    for k, v in settings.OSCAR_SLUG_MAP.items():
+        value = value.replace(k, v)
+    slugifier = import_string(settings.OSCAR_SLUG_FUNCTION)
+    value = slugifier(unidecode(six.text_type(value)))
+    for word in settings.OSCAR_SLUG_BLACKLIST:
+        value = value.replace(word + '-', '')
+        value = value.replace('-' + word, '')
+    return value
+
+
+def make_titles(count, distinct):
+    rng = random.Random(42)
+    pool = [u' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 7)))
+            for _ in range(distinct)]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def timed(function, titles):
+    start = time.time()
+    result = [function(title) for title in titles]
+    return time.time() - start, result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    titles = make_titles(count, distinct=max(1, count // 10))
+    previous_time, expected = timed(previous_slugify, titles)
+    current_time, result = timed(slugify, titles)
+    mismatches = sum(1 for a, b in zip(expected, result) if a != b)
+    print("%d titles" % count)
+    print("previous: %.2fs (%.0f titles/s)" % (
+        previous_time, count / previous_time))
+    print("current:  %.2fs (%.0f titles/s)" % (
+        current_time, count / current_time))
+    print("mismatches: %d" % mismatches)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,14 +2,21 @@ import re
 import zlib
 
 from django.db import models
+from django.utils import six
 from django.utils.encoding import python_2_unicode_compatible
-from django.utils.translation import ugettext_lazy as _, pgettext_lazy
+from django.utils.translation import (
+    ugettext_lazy as _, pgettext_lazy, get_language)
 from django.core import exceptions
 
+from oscar.apps.address.search_backends import get_search_backend
 from oscar.core.compat import AUTH_USER_MODEL
 from oscar.models.fields import UppercaseCharField, PhoneNumberField
 from django.utils.six.moves import filter
 
+# Names of the fields copied by populate_alternative_model, keyed by
+# (source model, destination model)
+_copy_plans = {}
+
 
 @python_2_unicode_compatible
 class AbstractAddress(models.Model):
@@ -231,13 +238,25 @@ class AbstractAddress(models.Model):
     country = models.ForeignKey('address.Country', verbose_name=_("Country"))
 
     #: A field only used for searching addresses - this contains all the
-    #: relevant fields.  This is effectively a poor man's Solr text field.
+    #: relevant fields. It is indexed by the backend configured in
+    #: OSCAR_ADDRESS_SEARCH_BACKEND.
     search_text = models.TextField(
         _("Search text - used only for searching addresses"), editable=False)
 
+    #: Fields that make up the summary, salutation, hash and search text.
+    #: Assigning to any of them invalidates the cached representation.
+    representation_fields = frozenset([
+        'title', 'first_name', 'last_name', 'line1', 'line2', 'line3',
+        'line4', 'state', 'postcode', 'country', 'country_id'])
+
     def __str__(self):
         return self.summary
 
+    def __setattr__(self, name, value):
+        if name in self.representation_fields:
+            self.__dict__.pop('_representation_cache', None)
+        super(AbstractAddress, self).__setattr__(name, value)
+
     class Meta:
         abstract = True
         verbose_name = _('Address')
@@ -248,6 +267,7 @@ class AbstractAddress(models.Model):
     def save(self, *args, **kwargs):
         self._update_search_text()
         super(AbstractAddress, self).save(*args, **kwargs)
+        get_search_backend().index(self)
 
     def clean(self):
         # Strip all whitespace
@@ -255,6 +275,7 @@ class AbstractAddress(models.Model):
                       'line4', 'state', 'postcode']:
             if self.__dict__[field]:
                 self.__dict__[field] = self.__dict__[field].strip()
+        self._clear_representation_cache()
 
         # Ensure postcodes are valid for country
         self.ensure_postcode_is_valid_for_country()
@@ -287,11 +308,34 @@ class AbstractAddress(models.Model):
                     {'postcode': [msg]})
 
     def _update_search_text(self):
+        self.search_text = self._get_cached(
+            'search_text', self._build_search_text)
+
+    def _build_search_text(self):
         search_fields = filter(
             bool, [self.first_name, self.last_name,
                    self.line1, self.line2, self.line3, self.line4,
                    self.state, self.postcode, self.country.name])
-        self.search_text = ' '.join(search_fields)
+        return ' '.join(search_fields)
+
+    # Caching
+
+    def _get_cached(self, key, build):
+        """
+        Return the cached value for key, calling build to compute it if needed.
+
+        The title is translated, so values are cached per active language.
+        """
+        cache = self.__dict__.setdefault('_representation_cache', {})
+        key = (key, get_language())
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = build()
+            return value
+
+    def _clear_representation_cache(self):
+        self.__dict__.pop('_representation_cache', None)
 
     # Properties
 
@@ -306,20 +350,22 @@ class AbstractAddress(models.Model):
         Returns a single string summary of the address,
         separating fields using commas.
         """
-        return u", ".join(self.active_address_fields())
+        return self._get_cached(
+            'summary', lambda: u", ".join(self.active_address_fields()))
 
     @property
     def salutation(self):
         """
         Name (including title)
         """
-        return self.join_fields(
+        return self._get_cached('salutation', lambda: self.join_fields(
             ('title', 'first_name', 'last_name'),
-            separator=u" ")
+            separator=u" "))
 
     @property
     def name(self):
-        return self.join_fields(('first_name', 'last_name'), separator=u" ")
+        return self._get_cached('name', lambda: self.join_fields(
+            ('first_name', 'last_name'), separator=u" "))
 
     # Helpers
 
@@ -328,7 +374,8 @@ class AbstractAddress(models.Model):
         Returns a hash of the address summary
         """
         # We use an upper-case version of the summary
-        return zlib.crc32(self.summary.strip().upper().encode('UTF8'))
+        return self._get_cached('hash', lambda: zlib.crc32(
+            self.summary.strip().upper().encode('UTF8')))
 
     def join_fields(self, fields, separator=u", "):
         """
@@ -352,17 +399,59 @@ class AbstractAddress(models.Model):
         This is used to convert a user address to a shipping address
         as part of the checkout process.
         """
-        destination_field_names = [
-            field.name for field in address_model._meta.fields]
-        for field_name in [field.name for field in self._meta.fields]:
-            if field_name in destination_field_names and field_name != 'id':
-                setattr(address_model, field_name, getattr(self, field_name))
+        for field_name in self.get_copy_plan(address_model.__class__):
+            setattr(address_model, field_name, getattr(self, field_name))
+
+    @classmethod
+    def get_copy_plan(cls, address_model_class):
+        """
+        Return the names of the fields that populate_alternative_model copies
+        from an instance of this class to an instance of address_model_class.
+        """
+        key = (cls, address_model_class)
+        try:
+            return _copy_plans[key]
+        except KeyError:
+            destination_field_names = set(
+                field.name for field in address_model_class._meta.fields)
+            plan = _copy_plans[key] = tuple(
+                field.name for field in cls._meta.fields
+                if field.name in destination_field_names
+                and field.name != 'id')
+            return plan
+
+    @classmethod
+    def populate_alternative_models(cls, addresses, address_model_class,
+                                    **kwargs):
+        """
+        Bulk version of populate_alternative_model.
+
+        Returns a list of unsaved address_model_class instances, one for each
+        of the passed addresses. Any keyword arguments are passed to the
+        constructor of each instance.
+
+        The instances are suitable for bulk_create, but note that it doesn't
+        call save(). Values computed there (e.g. UserAddress.hash) have to be
+        set by the caller.
+        """
+        instances = []
+        for address in addresses:
+            instance = address_model_class(**kwargs)
+            address.populate_alternative_model(instance)
+            instances.append(instance)
+        return instances
 
     def active_address_fields(self, include_salutation=True):
         """
         Return the non-empty components of the address, but merging the
         title, first_name and last_name into a single line.
         """
+        # Return a copy so callers can't modify the cached list
+        return list(self._get_cached(
+            ('active_address_fields', include_salutation),
+            lambda: self._build_active_address_fields(include_salutation)))
+
+    def _build_active_address_fields(self, include_salutation):
         fields = [self.line1, self.line2, self.line3,
                   self.line4, self.state, self.postcode]
         if include_salutation:
@@ -538,12 +627,66 @@ class AbstractUserAddress(AbstractShippingAddress):
 
     def validate_unique(self, exclude=None):
         super(AbstractAddress, self).validate_unique(exclude)
-        qs = self.__class__.objects.filter(
-            user=self.user,
-            hash=self.generate_hash())
-        if self.id:
-            qs = qs.exclude(id=self.id)
-        if qs.exists():
+        # Formsets set the hashes of the user's address book, so that they
+        # are only fetched once for all forms.
+        if self.is_duplicate(getattr(self, '_address_hashes', None)):
             raise exceptions.ValidationError({
-                '__all__': [_("This address is already in your address"
-                              " book")]})
+                '__all__': [self.get_duplicate_message()]})
+
+    def get_duplicate_message(self):
+        return _("This address is already in your address book")
+
+    def is_duplicate(self, address_hashes=None):
+        """
+        Whether this address is already in the user's address book.
+
+        address_hashes is a mapping as returned by get_address_hashes. If it
+        isn't passed, the database is queried.
+        """
+        if address_hashes is None:
+            qs = self.__class__.objects.filter(
+                user=self.user,
+                hash=self.generate_hash())
+            if self.id:
+                qs = qs.exclude(id=self.id)
+            return qs.exists()
+        address_id = address_hashes.get(self.user_id, {}).get(
+            six.text_type(self.generate_hash()))
+        return address_id is not None and address_id != self.id
+
+    @classmethod
+    def get_address_hashes(cls, user_ids):
+        """
+        Fetch the address hashes of the given users with a single query.
+
+        Returns a dictionary mapping each user ID to a dictionary of address
+        hash to address ID.
+        """
+        address_hashes = {}
+        rows = cls._default_manager.filter(user_id__in=user_ids).values_list(
+            'user_id', 'hash', 'id')
+        for user_id, hash, address_id in rows:
+            address_hashes.setdefault(user_id, {})[hash] = address_id
+        return address_hashes
+
+    @classmethod
+    def validate_unique_batch(cls, addresses):
+        """
+        Check many addresses for duplicates at once.
+
+        Existing hashes are fetched with a single query for all users. An
+        address that repeats an earlier address of the same user in the batch
+        counts as a duplicate as well. Returns a dictionary that maps the
+        index of every duplicate to a ValidationError.
+        """
+        address_hashes = cls.get_address_hashes(
+            set(address.user_id for address in addresses))
+        seen = set()
+        errors = {}
+        for index, address in enumerate(addresses):
+            key = (address.user_id, address.generate_hash())
+            if key in seen or address.is_duplicate(address_hashes):
+                errors[index] = exceptions.ValidationError(
+                    address.get_duplicate_message())
+            seen.add(key)
+        return errors
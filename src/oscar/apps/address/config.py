@@ -6,3 +6,6 @@ class AddressConfig(AppConfig):
     label = 'address'
     name = 'oscar.apps.address'
     verbose_name = _('Address')
+
+    def ready(self):
+        from oscar.apps.address import receivers  # noqa
@@ -1,11 +1,16 @@
 from django.conf import settings
 from django import forms
+from django.forms.models import BaseModelFormSet, modelformset_factory
+from django.utils.functional import cached_property
 
 from oscar.core.loading import get_model
+from oscar.forms.widgets import CachedOptionsSelect
 from oscar.views.generic import PhoneNumberMixin
 
 UserAddress = get_model('address', 'useraddress')
 
+COUNTRY_OPTIONS_VERSION_KEY = 'oscar-address-countries-version'
+
 
 class AbstractAddressForm(forms.ModelForm):
 
@@ -18,6 +23,21 @@ class AbstractAddressForm(forms.ModelForm):
                        set(settings.OSCAR_REQUIRED_ADDRESS_FIELDS))
         for field_name in field_names:
             self.fields[field_name].required = True
+        self.use_cached_country_options()
+
+    def use_cached_country_options(self):
+        """
+        Render the country choices from a cache, as they rarely change
+        """
+        field = self.fields.get('country')
+        if field is None or type(field.widget) is not forms.Select:
+            return
+        widget = CachedOptionsSelect(
+            attrs=field.widget.attrs, cache_key='oscar-address-countries',
+            version_key=COUNTRY_OPTIONS_VERSION_KEY)
+        widget.is_required = field.widget.is_required
+        widget.choices = field.choices
+        field.widget = widget
 
 
 class UserAddressForm(PhoneNumberMixin, AbstractAddressForm):
@@ -34,3 +54,59 @@ class UserAddressForm(PhoneNumberMixin, AbstractAddressForm):
     def __init__(self, user, *args, **kwargs):
         super(UserAddressForm, self).__init__(*args, **kwargs)
         self.instance.user = user
+
+
+class BaseUserAddressFormSet(BaseModelFormSet):
+    """
+    Formset for editing the address book of a user.
+
+    The hashes of the user's addresses are fetched once for the whole formset
+    instead of each form checking for duplicates with a separate query.
+    """
+
+    def __init__(self, user, *args, **kwargs):
+        self.user = user
+        kwargs.setdefault('queryset', UserAddress._default_manager.filter(
+            user=user))
+        super(BaseUserAddressFormSet, self).__init__(*args, **kwargs)
+
+    @cached_property
+    def address_hashes(self):
+        return UserAddress.get_address_hashes([self.user.pk])
+
+    def _construct_form(self, i, **kwargs):
+        kwargs['user'] = self.user
+        form = super(BaseUserAddressFormSet, self)._construct_form(i, **kwargs)
+        form.instance._address_hashes = self.address_hashes
+        return form
+
+    @property
+    def empty_form(self):
+        form = self.form(
+            self.user,
+            auto_id=self.auto_id,
+            prefix=self.add_prefix('__prefix__'),
+            empty_permitted=True,
+        )
+        self.add_fields(form, None)
+        return form
+
+    def clean(self):
+        super(BaseUserAddressFormSet, self).clean()
+        # The forms were checked against the stored addresses, but two forms
+        # might still contain the same address.
+        seen = set()
+        for form in self.forms:
+            if not form.is_valid() or not form.has_changed():
+                continue
+            if self.can_delete and self._should_delete_form(form):
+                continue
+            address_hash = form.instance.generate_hash()
+            if address_hash in seen:
+                form.add_error(None, form.instance.get_duplicate_message())
+            seen.add(address_hash)
+
+
+UserAddressFormSet = modelformset_factory(
+    UserAddress, form=UserAddressForm, formset=BaseUserAddressFormSet,
+    extra=0)
@@ -0,0 +1,192 @@
+import collections
+import time
+
+from django.core import exceptions
+from django.db.models.functions import Lower
+from django.utils import six
+
+import phonenumbers
+
+from oscar.apps.customer.utils import normalise_email
+from oscar.core.compat import UnicodeCSVReader, get_user_model
+from oscar.core.loading import get_model
+from oscar.core.phonenumber import PhoneNumber
+
+Country = get_model('address', 'Country')
+UserAddress = get_model('address', 'UserAddress')
+User = get_user_model()
+
+
+class UserAddressImporter(object):
+    """
+    Imports user addresses from a CSV file.
+
+    Each row has to contain the columns listed in ``columns``, in that order.
+    Rows are validated and written in batches: each batch costs one query to
+    look up the users, one to fetch the users' existing address hashes and
+    the inserts themselves. Addresses that are already in a user's address
+    book, or that occur more than once in the file, are skipped. Email
+    addresses are matched case-insensitively; rows whose address belongs to
+    several users are rejected as ambiguous.
+
+    Imported addresses are never made the default shipping or billing
+    address, so there is no need to ensure the integrity of the defaults.
+    bulk_create doesn't call save(), so search backends that maintain their
+    own index need to be rebuilt after an import.
+    """
+    columns = (
+        'email', 'title', 'first_name', 'last_name',
+        'line1', 'line2', 'line3', 'line4', 'state', 'postcode',
+        'country', 'phone_number', 'notes')
+
+    def __init__(self, logger, delimiter=",", batch_size=1000,
+                 skip_header=False):
+        self.logger = logger
+        self.delimiter = delimiter
+        self.batch_size = batch_size
+        self.skip_header = skip_header
+        self._countries = None
+
+    def handle(self, file_path):
+        """
+        Import the addresses of the given CSV file and return the statistics
+        """
+        with UnicodeCSVReader(file_path, delimiter=self.delimiter) as reader:
+            if self.skip_header:
+                next(reader, None)
+            return self.import_rows(reader)
+
+    def import_rows(self, rows):
+        """
+        Import addresses from an iterable of rows and return the statistics
+        """
+        stats = {'created': 0, 'duplicates': 0, 'invalid': 0}
+        # (user_id, hash) pairs of all addresses seen so far
+        seen = set()
+        start = time.time()
+        batch = []
+        for row_number, row in enumerate(rows, start=1):
+            batch.append((row_number, row))
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch, seen, stats)
+                batch = []
+        if batch:
+            self._import_batch(batch, seen, stats)
+        stats['seconds'] = time.time() - start
+        total = stats['created'] + stats['duplicates'] + stats['invalid']
+        stats['rows_per_second'] = (
+            total / stats['seconds'] if stats['seconds'] else 0)
+        self.logger.info(
+            "Created: %(created)d, duplicates: %(duplicates)d, "
+            "invalid: %(invalid)d in %(seconds).1fs "
+            "(%(rows_per_second).0f rows/s)" % stats)
+        return stats
+
+    @property
+    def countries(self):
+        if self._countries is None:
+            self._countries = dict(
+                (country.iso_3166_1_a2, country)
+                for country in Country._default_manager.all())
+        return self._countries
+
+    def _import_batch(self, batch, seen, stats):
+        rows = []
+        for row_number, row in batch:
+            if len(row) != len(self.columns):
+                self.logger.error(
+                    "Row %d: expected %d columns, got %d" % (
+                        row_number, len(self.columns), len(row)))
+                stats['invalid'] += 1
+                continue
+            data = dict(zip(self.columns, (value.strip() for value in row)))
+            try:
+                data['email'] = normalise_email(data['email'])
+            except ValueError:
+                # More than one @
+                self.logger.error("Row %d: invalid email address '%s'" % (
+                    row_number, data['email']))
+                stats['invalid'] += 1
+                continue
+            rows.append((row_number, data))
+
+        # Match email addresses case-insensitively, like EmailBackend
+        emails = set(data['email'].lower() for _, data in rows)
+        users = User._default_manager.annotate(
+            email_lower=Lower('email')).filter(email_lower__in=emails)
+        user_ids = collections.defaultdict(list)
+        for email, pk in users.values_list('email_lower', 'pk'):
+            user_ids[email].append(pk)
+        address_hashes = UserAddress.get_address_hashes(
+            set(pk for pks in user_ids.values() for pk in pks))
+
+        addresses = []
+        for row_number, data in rows:
+            try:
+                address = self._build_address(data, user_ids)
+            except exceptions.ValidationError as e:
+                self.logger.error("Row %d: %s" % (
+                    row_number, '; '.join(e.messages)))
+                stats['invalid'] += 1
+                continue
+            key = (address.user_id, address.hash)
+            if key in seen or address.is_duplicate(address_hashes):
+                stats['duplicates'] += 1
+                continue
+            seen.add(key)
+            addresses.append(address)
+
+        UserAddress._default_manager.bulk_create(addresses)
+        stats['created'] += len(addresses)
+
+    def _build_address(self, data, user_ids):
+        user_id_list = user_ids.get(data['email'].lower(), [])
+        if not user_id_list:
+            raise exceptions.ValidationError(
+                "No user with email address '%s'" % data['email'])
+        if len(user_id_list) > 1:
+            raise exceptions.ValidationError(
+                "Several users with email address '%s'" % data['email'])
+        user_id = user_id_list[0]
+        try:
+            country = self.countries[data['country'].upper()]
+        except KeyError:
+            raise exceptions.ValidationError(
+                "Unknown country '%s'" % data['country'])
+
+        address = UserAddress(
+            user_id=user_id, country=country,
+            phone_number=self._clean_phone_number(
+                data['phone_number'], country),
+            **dict((column, data[column]) for column in (
+                'title', 'first_name', 'last_name', 'line1', 'line2',
+                'line3', 'line4', 'state', 'postcode', 'notes')))
+        # Check lengths and choices, as the database would reject the whole
+        # batch otherwise
+        try:
+            address.clean_fields(exclude=[
+                'user', 'country', 'hash', 'search_text', 'phone_number'])
+        except exceptions.ValidationError as e:
+            raise exceptions.ValidationError([
+                '%s: %s' % (field, message)
+                for field, messages in sorted(e.message_dict.items())
+                for message in messages])
+        address.ensure_postcode_is_valid_for_country()
+
+        # Do what save() would do
+        address.hash = six.text_type(address.generate_hash())
+        address._update_search_text()
+        return address
+
+    def _clean_phone_number(self, number, country):
+        if not number:
+            return u''
+        try:
+            phone_number = PhoneNumber.from_string(
+                number, region=country.iso_3166_1_a2)
+        except phonenumbers.NumberParseException:
+            phone_number = None
+        if phone_number is None or not phone_number.is_valid():
+            raise exceptions.ValidationError(
+                "Invalid phone number '%s'" % number)
+        return phone_number.as_e164
@@ -0,0 +1,42 @@
+import logging
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from oscar.core.loading import get_class
+
+UserAddressImporter = get_class('address.importers', 'UserAddressImporter')
+
+logger = logging.getLogger('oscar.address.import')
+
+
+class Command(BaseCommand):
+    help = "Import user addresses from CSV files"
+
+    def add_arguments(self, parser):
+        parser.add_argument('filenames', metavar='filename', nargs='+')
+        parser.add_argument(
+            '--delimiter', dest='delimiter', default=",",
+            help="Delimiter used within the CSV file(s)")
+        parser.add_argument(
+            '--batch-size', dest='batch_size', type=int, default=1000,
+            help="Number of rows validated and inserted at once")
+        parser.add_argument(
+            '--skip-header', dest='skip_header', action='store_true',
+            default=False, help="Skip the first row of each file")
+
+    def handle(self, *args, **options):
+        importer = UserAddressImporter(
+            logger, delimiter=options['delimiter'],
+            batch_size=options['batch_size'],
+            skip_header=options['skip_header'])
+        for file_path in options['filenames']:
+            if not os.path.isfile(file_path):
+                raise CommandError("%s is not a file" % file_path)
+            logger.info(" - Importing addresses from %s" % file_path)
+            stats = importer.handle(file_path)
+            self.stdout.write(
+                "%s: %d created, %d duplicates, %d invalid, "
+                "%.0f rows/s" % (
+                    file_path, stats['created'], stats['duplicates'],
+                    stats['invalid'], stats['rows_per_second']))
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # The expression has to match PostgresSearchBackend for the index to
+    # be used. Other databases don't support expression GIN indexes.
+    #
+    # Migrations run within a transaction, so this locks the table against
+    # writes while the index is built. On large tables, build the index by
+    # hand before migrating, which makes this a no-op:
+    #
+    #   CREATE INDEX CONCURRENTLY address_useraddress_search_text_fts
+    #   ON address_useraddress USING gin
+    #   (to_tsvector('simple', search_text));
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    UserAddress = apps.get_model('address', 'UserAddress')
+    table = UserAddress._meta.db_table
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS %s ON %s USING gin "
+        "(to_tsvector('simple', search_text))" % (
+            schema_editor.quote_name('%s_search_text_fts' % table),
+            schema_editor.quote_name(table)))
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    UserAddress = apps.get_model('address', 'UserAddress')
+    schema_editor.execute("DROP INDEX IF EXISTS %s" % schema_editor.quote_name(
+        '%s_search_text_fts' % UserAddress._meta.db_table))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('address', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
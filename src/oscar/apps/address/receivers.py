@@ -0,0 +1,32 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from oscar.apps.address.abstract_models import AbstractAddress
+from oscar.apps.address.forms import COUNTRY_OPTIONS_VERSION_KEY
+from oscar.apps.address.search_backends import get_search_backend
+from oscar.core.loading import get_model
+from oscar.forms.widgets import bump_options_version
+
+Country = get_model('address', 'Country')
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+def invalidate_country_options(sender, **kwargs):
+    bump_options_version(COUNTRY_OPTIONS_VERSION_KEY)
+
+
+def remove_address_from_search_index(sender, instance, **kwargs):
+    get_search_backend().remove(instance)
+
+
+# Connected per address model, as receivers without a sender would stop
+# Django from fast-deleting any model. Unlike a delete() override, this
+# also covers QuerySet.delete() and cascades.
+for model in apps.get_models():
+    if issubclass(model, AbstractAddress):
+        post_delete.connect(
+            remove_address_from_search_index, sender=model,
+            dispatch_uid='remove-address-from-search-index-%s.%s' % (
+                model._meta.app_label, model._meta.model_name))
@@ -0,0 +1,285 @@
+"""
+Pluggable full-text search backends for addresses.
+
+``AbstractAddress.search_text`` holds the searchable representation of an
+address. The backend configured in ``OSCAR_ADDRESS_SEARCH_BACKEND`` decides
+how that text is indexed and queried:
+
+* ``SimpleSearchBackend`` - ``icontains`` scans over ``search_text``. Works
+  everywhere, but doesn't scale to large address books.
+* ``PostgresSearchBackend`` - ``tsvector`` matching that is served by the GIN
+  index created in the ``0002_search_text_index`` migration. Address models
+  without such an index are searched like with ``SimpleSearchBackend``.
+* ``SQLiteSearchBackend`` - an FTS5 virtual table per address table. Useful
+  for local development and testing.
+* ``InMemorySearchBackend`` - a per-process inverted index. Only useful for
+  tests and small deployments, as it has to be populated with ``rebuild``.
+"""
+import bisect
+import re
+import threading
+
+from django.conf import settings
+from django.db import OperationalError, connections, router
+from django.utils import six
+
+from oscar.core.loading import import_string
+
+_backend = None
+
+token_re = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenise(text):
+    """
+    Split text into lower-cased search terms
+    """
+    if not text:
+        return []
+    return token_re.findall(six.text_type(text).lower())
+
+
+def get_search_backend():
+    """
+    Return the (cached) instance of the configured address search backend
+    """
+    global _backend
+    backend_path = getattr(
+        settings, 'OSCAR_ADDRESS_SEARCH_BACKEND',
+        'oscar.apps.address.search_backends.SimpleSearchBackend')
+    if _backend is None or _backend.path != backend_path:
+        backend = import_string(backend_path)()
+        backend.path = backend_path
+        _backend = backend
+    return _backend
+
+
+def search(queryset, query):
+    """
+    Filter an address queryset using the configured search backend
+    """
+    return get_search_backend().search(queryset, query)
+
+
+class BaseSearchBackend(object):
+    """
+    Base class for address search backends.
+
+    ``index`` and ``remove`` are called whenever an address is saved or
+    deleted, so backends that maintain their own index can keep it up to date
+    incrementally.
+    """
+    path = None
+
+    def index(self, address):
+        """
+        Add or update the given (saved) address in the index
+        """
+
+    def remove(self, address):
+        """
+        Remove the given address from the index
+        """
+
+    def rebuild(self, queryset):
+        """
+        (Re-)index all addresses of the given queryset
+        """
+        for address in queryset.iterator():
+            self.index(address)
+
+    def search(self, queryset, query):
+        """
+        Return the addresses of ``queryset`` that match all terms of ``query``
+        """
+        raise NotImplementedError
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """
+    Search by scanning ``search_text`` for each of the search terms
+    """
+
+    def search(self, queryset, query):
+        for term in tokenise(query):
+            queryset = queryset.filter(search_text__icontains=term)
+        return queryset
+
+
+class PostgresSearchBackend(SimpleSearchBackend):
+    """
+    Search using PostgreSQL's full-text search.
+
+    PostgreSQL maintains the GIN index itself, so there is nothing to do when
+    addresses change. The text search configuration has to match the one
+    used by the index, otherwise the index is ignored by the planner.
+
+    Without the index, computing the tsvector of every row is slower than
+    scanning with icontains. So only the models listed in indexed_models (as
+    (app label, model name) pairs) are searched with tsvector matching, the
+    others like SimpleSearchBackend. Subclasses can add models whose tables
+    have a matching index.
+    """
+    config = 'simple'
+    indexed_models = frozenset([('address', 'useraddress')])
+
+    def search(self, queryset, query):
+        opts = queryset.model._meta.concrete_model._meta
+        if (opts.app_label, opts.model_name) not in self.indexed_models:
+            return super(PostgresSearchBackend, self).search(queryset, query)
+        terms = tokenise(query)
+        if not terms:
+            return queryset
+        connection = connections[queryset.db]
+        column = '%s.%s' % (
+            connection.ops.quote_name(queryset.model._meta.db_table),
+            connection.ops.quote_name('search_text'))
+        # Terms only consist of word characters, so they can't contain any
+        # tsquery operators. Every term is matched as a prefix.
+        ts_query = ' & '.join('%s:*' % term for term in terms)
+        return queryset.extra(
+            where=["to_tsvector('%s', %s) @@ to_tsquery('%s', %%s)" % (
+                self.config, column, self.config)],
+            params=[ts_query])
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    Search using an SQLite FTS5 table that shadows the address table.
+
+    The FTS table is keyed by the address' primary key and is created when
+    it's missing. SQLite rolls back DDL together with the transaction it ran
+    in, so whether the table exists isn't remembered. Existing addresses can
+    be added with ``rebuild``.
+    """
+
+    def get_table_name(self, model):
+        return '%s_fts' % model._meta.db_table
+
+    def create_table(self, connection, model):
+        connection.cursor().execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS %s USING fts5(search_text)'
+            % connection.ops.quote_name(self.get_table_name(model)))
+
+    def _execute(self, model, statements):
+        """
+        Execute (sql, params) statements on the FTS table of model, whose
+        quoted name is substituted for %(table)s. Creates the table and
+        retries if it doesn't exist.
+        """
+        connection = connections[router.db_for_write(model)]
+        table = connection.ops.quote_name(self.get_table_name(model))
+        for attempt in range(2):
+            try:
+                with connection.cursor() as cursor:
+                    for sql, params in statements:
+                        cursor.execute(sql % {'table': table}, params)
+                return
+            except OperationalError as e:
+                if attempt or 'no such table' not in six.text_type(e):
+                    raise
+            self.create_table(connection, model)
+
+    def index(self, address):
+        self._execute(address.__class__, [
+            ('DELETE FROM %(table)s WHERE rowid = %%s', [address.pk]),
+            ('INSERT INTO %(table)s (rowid, search_text) VALUES (%%s, %%s)',
+             [address.pk, address.search_text]),
+        ])
+
+    def remove(self, address):
+        self._execute(address.__class__, [
+            ('DELETE FROM %(table)s WHERE rowid = %%s', [address.pk]),
+        ])
+
+    def search(self, queryset, query):
+        terms = tokenise(query)
+        if not terms:
+            return queryset
+        connection = connections[queryset.db]
+        # The query is only run later, so the table has to exist now
+        self.create_table(connection, queryset.model)
+        table = connection.ops.quote_name(
+            self.get_table_name(queryset.model))
+        pk_column = '%s.%s' % (
+            connection.ops.quote_name(queryset.model._meta.db_table),
+            connection.ops.quote_name(queryset.model._meta.pk.column))
+        match = ' '.join('"%s"*' % term for term in terms)
+        return queryset.extra(
+            where=['%s IN (SELECT rowid FROM %s WHERE %s MATCH %%s)' % (
+                pk_column, table, table)],
+            params=[match])
+
+
+class InMemorySearchBackend(BaseSearchBackend):
+    """
+    Search using an inverted index kept in the memory of the current process
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Per model: term -> set of primary keys
+        self._postings = {}
+        # Per model: primary key -> terms, needed to remove stale postings
+        self._documents = {}
+        # Per model: sorted list of terms, for prefix matching
+        self._terms = {}
+
+    def _get_key(self, model):
+        opts = model._meta.concrete_model._meta
+        return opts.app_label, opts.model_name
+
+    def _remove(self, key, pk):
+        terms = self._documents.get(key, {}).pop(pk, ())
+        postings = self._postings.get(key, {})
+        for term in terms:
+            pks = postings.get(term)
+            if pks is not None:
+                pks.discard(pk)
+                if not pks:
+                    del postings[term]
+                    self._terms.pop(key, None)
+
+    def index(self, address):
+        key = self._get_key(address.__class__)
+        terms = set(tokenise(address.search_text))
+        with self._lock:
+            self._remove(key, address.pk)
+            postings = self._postings.setdefault(key, {})
+            for term in terms:
+                if term not in postings:
+                    postings[term] = set()
+                    self._terms.pop(key, None)
+                postings[term].add(address.pk)
+            self._documents.setdefault(key, {})[address.pk] = terms
+
+    def remove(self, address):
+        key = self._get_key(address.__class__)
+        with self._lock:
+            self._remove(key, address.pk)
+
+    def _get_matching_pks(self, key, term):
+        postings = self._postings.get(key, {})
+        terms = self._terms.get(key)
+        if terms is None:
+            terms = self._terms[key] = sorted(postings)
+        pks = set()
+        position = bisect.bisect_left(terms, term)
+        while position < len(terms) and terms[position].startswith(term):
+            pks.update(postings[terms[position]])
+            position += 1
+        return pks
+
+    def search(self, queryset, query):
+        terms = tokenise(query)
+        if not terms:
+            return queryset
+        key = self._get_key(queryset.model)
+        with self._lock:
+            pks = None
+            for term in terms:
+                matches = self._get_matching_pks(key, term)
+                pks = matches if pks is None else pks & matches
+                if not pks:
+                    break
+        return queryset.filter(pk__in=pks)
@@ -1,8 +1,14 @@
+from multiprocessing import Pool
+
 from django.contrib.auth import models as auth_models
+from django.contrib.auth.hashers import make_password
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 
+from oscar.apps.customer.utils import normalise_email
+
 
 class UserManager(auth_models.BaseUserManager):
 
@@ -24,6 +30,90 @@ class UserManager(auth_models.BaseUserManager):
         user.save(using=self._db)
         return user
 
+    def bulk_create_users(self, rows, batch_size=1000, processes=None):
+        """
+        Create many users at once.
+
+        Each row is a dictionary of field values that has to contain an
+        'email' and can contain a 'password'. Users without a password get an
+        unusable one. Email addresses are normalised, and rows with an invalid
+        address, or an address that already exists or that occurred in an
+        earlier row (compared case-insensitively), are skipped.
+
+        Passwords are hashed in a pool of the given number of processes if
+        processes is set, and inline otherwise. Users are inserted with
+        bulk_create in chunks of batch_size.
+
+        Returns the number of created and skipped users.
+        """
+        created = skipped = 0
+        seen = set()
+        pool = Pool(processes) if processes else None
+        try:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    counts = self._bulk_create_batch(batch, seen, pool)
+                    created, skipped = created + counts[0], skipped + counts[1]
+                    batch = []
+            if batch:
+                counts = self._bulk_create_batch(batch, seen, pool)
+                created, skipped = created + counts[0], skipped + counts[1]
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        return created, skipped
+
+    def _bulk_create_batch(self, rows, seen, pool):
+        now = timezone.now()
+        users = []
+        passwords = []
+        skipped = 0
+        for row in rows:
+            extra_fields = dict(row)
+            try:
+                email = normalise_email(
+                    extra_fields.pop('email', None) or '')
+            except ValueError:
+                # More than one @
+                skipped += 1
+                continue
+            # Email addresses are matched case-insensitively, like
+            # EmailBackend does
+            if not email or email.lower() in seen:
+                skipped += 1
+                continue
+            seen.add(email.lower())
+            passwords.append(extra_fields.pop('password', None) or None)
+            extra_fields.setdefault('is_staff', False)
+            extra_fields.setdefault('is_active', True)
+            extra_fields.setdefault('is_superuser', False)
+            extra_fields.setdefault('date_joined', now)
+            users.append(self.model(email=email, **extra_fields))
+
+        existing = set(self.annotate(email_lower=Lower('email')).filter(
+            email_lower__in=[user.email.lower() for user in users]
+        ).values_list('email_lower', flat=True))
+        if existing:
+            new = [(user, password) for user, password in zip(users, passwords)
+                   if user.email.lower() not in existing]
+            skipped += len(users) - len(new)
+            users = [user for user, _ in new]
+            passwords = [password for _, password in new]
+
+        # make_password(None) returns an unusable password
+        if pool is not None:
+            hashed_passwords = pool.map(make_password, passwords)
+        else:
+            hashed_passwords = [make_password(p) for p in passwords]
+        for user, hashed_password in zip(users, hashed_passwords):
+            user.password = hashed_password
+
+        self.bulk_create(users)
+        return len(users), skipped
+
     def create_superuser(self, email, password, **extra_fields):
         u = self.create_user(email, password, **extra_fields)
         u.is_staff = True
@@ -1,8 +1,17 @@
+import threading
 import warnings
+from multiprocessing.pool import ThreadPool
 
+from django.conf import settings
+from django.contrib.auth import hashers
 from django.contrib.auth.backends import ModelBackend
-from django.core.exceptions import ImproperlyConfigured
+from django.core.exceptions import ImproperlyConfigured, PermissionDenied
+from django.db import connections, router
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.functions import Lower
 
+from oscar.apps.customer import user_cache
+from oscar.apps.customer.throttling import get_login_throttle
 from oscar.apps.customer.utils import normalise_email
 from oscar.core.compat import get_user_model
 
@@ -15,6 +24,63 @@ if hasattr(User, 'REQUIRED_FIELDS'):
             " field with blank=False")
 
 
+# Database vendors the customer app creates an index on LOWER(email) for
+LOWER_EMAIL_INDEX_VENDORS = ('postgresql', 'sqlite')
+
+_lock = threading.Lock()
+_hashing_semaphore = (None, None)
+_hashing_pool = (None, None)
+
+
+def get_hashing_semaphore():
+    """
+    Return the semaphore that limits the number of passwords hashed
+    concurrently by this process, or None if there is no limit.
+    """
+    global _hashing_semaphore
+    limit = getattr(settings, 'OSCAR_AUTH_MAX_CONCURRENT_HASHES', None)
+    with _lock:
+        if _hashing_semaphore[0] != limit:
+            _hashing_semaphore = (
+                limit, threading.BoundedSemaphore(limit) if limit else None)
+        return _hashing_semaphore[1]
+
+
+def get_hashing_pool():
+    """
+    Return the thread pool used to verify passwords of several candidates,
+    or None if candidates are verified one after the other.
+    """
+    global _hashing_pool
+    workers = getattr(settings, 'OSCAR_AUTH_HASH_WORKERS', 1)
+    with _lock:
+        if _hashing_pool[0] != workers:
+            if _hashing_pool[1] is not None:
+                _hashing_pool[1].close()
+            _hashing_pool = (
+                workers, ThreadPool(workers) if workers > 1 else None)
+        return _hashing_pool[1]
+
+
+def verify_password(password, encoded):
+    """
+    Check a password against an encoded password without touching the
+    database, which makes it safe to call from worker threads.
+
+    Returns a tuple of whether the password is correct and whether its hash
+    has to be upgraded.
+    """
+    upgrade = []
+    semaphore = get_hashing_semaphore()
+    if semaphore is None:
+        is_correct = hashers.check_password(password, encoded, upgrade.append)
+    else:
+        with semaphore:
+            is_correct = hashers.check_password(
+                password, encoded, upgrade.append)
+    return is_correct, bool(upgrade)
+
+
 class EmailBackend(ModelBackend):
     """
     Custom auth backend that uses an email address and password
@@ -34,15 +100,34 @@ class EmailBackend(ModelBackend):
         if '@' not in clean_email:
             return None
 
+        # Reject throttled attempts before querying and hashing. Raising
+        # PermissionDenied stops Django from trying other backends.
+        # Attempts are only throttled by IP address if request=request is
+        # passed to authenticate(), e.g. by EmailAuthenticationForm.
+        throttle = get_login_throttle()
+        if throttle is not None and not throttle.allow(
+                clean_email, kwargs.get('request')):
+            raise PermissionDenied
+
         # Since Django doesn't enforce emails to be unique, we look for all
         # matching users and try to authenticate them all. Note that we
         # intentionally allow multiple users with the same email address
         # (has been a requirement in larger system deployments),
         # we just enforce that they don't share the same password.
-        # We make a case-insensitive match when looking for emails.
-        matching_users = User.objects.filter(email__iexact=clean_email)
-        authenticated_users = [
-            user for user in matching_users if user.check_password(password)]
+        matching_users = self.get_matching_users(clean_email)
+        max_candidates = getattr(settings, 'OSCAR_AUTH_MAX_CANDIDATES', None)
+        if max_candidates:
+            # Bound the number of (deliberately slow) password checks,
+            # preferring the most recent logins. PostgreSQL sorts NULLs
+            # first in descending order, so users who never logged in are
+            # explicitly sorted last.
+            matching_users = matching_users.annotate(
+                never_logged_in=Case(
+                    When(last_login__isnull=True, then=Value(1)),
+                    default=Value(0), output_field=IntegerField())
+            ).order_by('never_logged_in', '-last_login')[:max_candidates]
+        authenticated_users = self.check_passwords(
+            list(matching_users), password)
         if len(authenticated_users) == 1:
             # Happy path
             return authenticated_users[0]
@@ -55,6 +140,66 @@ class EmailBackend(ModelBackend):
                 "password")
         return None
 
+    def get_user(self, user_id):
+        """
+        Return the user with the given ID, from the user cache if enabled
+        (see OSCAR_USER_CACHE)
+        """
+        return user_cache.load_user(user_id, self._load_user)
+
+    def _load_user(self, user_id):
+        user = super(EmailBackend, self).get_user(user_id)
+        if user is not None and user_cache.get_cache() is not None:
+            # Load the permissions so they are cached with the user
+            self.get_all_permissions(user)
+        return user
+
+    def check_passwords(self, users, password):
+        """
+        Return the users whose password matches the given one
+        """
+        pool = get_hashing_pool() if len(users) > 1 else None
+        if pool is None:
+            semaphore = get_hashing_semaphore()
+            if semaphore is None:
+                return [
+                    user for user in users if user.check_password(password)]
+            authenticated_users = []
+            for user in users:
+                with semaphore:
+                    if user.check_password(password):
+                        authenticated_users.append(user)
+            return authenticated_users
+
+        results = pool.map(
+            lambda user: verify_password(password, user.password), users)
+        authenticated_users = []
+        for user, (is_correct, upgrade) in zip(users, results):
+            if is_correct:
+                if upgrade:
+                    # Same as the setter of AbstractBaseUser.check_password,
+                    # but in this thread so it uses this thread's connection
+                    user.set_password(password)
+                    user.save(update_fields=['password'])
+                authenticated_users.append(user)
+        return authenticated_users
+
+    def get_matching_users(self, email):
+        """
+        Return the users with the given email address, matched
+        case-insensitively.
+
+        On the databases that have an index on LOWER(email) (see the
+        customer app's migrations), we compare LOWER(email) rather than using
+        __iexact, which wouldn't use that index. Elsewhere __iexact can use
+        the database's own index on email.
+        """
+        alias = router.db_for_read(User)
+        if connections[alias].vendor not in LOWER_EMAIL_INDEX_VENDORS:
+            return User._default_manager.filter(email__iexact=email)
+        return User._default_manager.annotate(
+            email_lower=Lower('email')).filter(email_lower=email.lower())
+
 
 # Deprecated since Oscar 1.0 because of the spelling.
 class Emailbackend(EmailBackend):
@@ -5,4 +5,7 @@ from django.utils.translation import ugettext_lazy as _
 class CustomerConfig(AppConfig):
     label = 'customer'
     name = 'oscar.apps.customer'
-    verbose_name = _('Customer')
\ No newline at end of file
+    verbose_name = _('Customer')
+
+    def ready(self):
+        from oscar.apps.customer import receivers  # noqa
@@ -1,21 +1,72 @@
 import string
-import random
+from random import SystemRandom
+
+from django import forms
+from django.contrib.auth import authenticate
+from django.contrib.auth.forms import AuthenticationForm
 
 from oscar.core.compat import get_user_model
 
 User = get_user_model()
 
+USERNAME_CHARS = string.ascii_letters + string.digits + '_'
+USERNAME_LENGTH = 30
+
+_random = SystemRandom()
+
+
+def _random_username():
+    return ''.join(_random.choice(USERNAME_CHARS)
+                   for i in range(USERNAME_LENGTH))
+
+
+def generate_usernames(count, batch_size=500):
+    """
+    Return a list of count usernames that aren't taken yet.
+
+    Candidates are drawn from a cryptographically secure source and checked
+    for collisions with one query per batch_size candidates. Collisions are
+    practically impossible, but any are replaced by new candidates.
+    """
+    usernames = set()
+    while len(usernames) < count:
+        candidates = set()
+        while len(candidates) < min(count - len(usernames), batch_size):
+            candidate = _random_username()
+            if candidate not in usernames:
+                candidates.add(candidate)
+        taken = User._default_manager.filter(
+            username__in=candidates).values_list('username', flat=True)
+        usernames.update(candidates.difference(taken))
+    return list(usernames)
+
 
 def generate_username():
-    # Python 3 uses ascii_letters. If not available, fallback to letters
-    try:
-        letters = string.ascii_letters
-    except AttributeError:
-        letters = string.letters
-    uname = ''.join([random.choice(letters + string.digits + '_')
-                     for i in range(30)])
-    try:
-        User.objects.get(username=uname)
-        return generate_username()
-    except User.DoesNotExist:
-        return uname
\ No newline at end of file
+    return generate_usernames(1)[0]
+
+
+class EmailAuthenticationForm(AuthenticationForm):
+    """
+    AuthenticationForm that passes the request on to authenticate(), so
+    EmailBackend can throttle login attempts per IP address as well (see
+    oscar.apps.customer.throttling). Django's authenticate() doesn't pass
+    the request on by itself.
+    """
+
+    def clean(self):
+        username = self.cleaned_data.get('username')
+        password = self.cleaned_data.get('password')
+
+        if username and password:
+            self.user_cache = authenticate(
+                username=username, password=password, request=self.request)
+            if self.user_cache is None:
+                raise forms.ValidationError(
+                    self.error_messages['invalid_login'],
+                    code='invalid_login',
+                    params={'username': self.username_field.verbose_name},
+                )
+            else:
+                self.confirm_login_allowed(self.user_cache)
+
+        return self.cleaned_data
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations
+
+
+def get_index_details(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    table = User._meta.db_table
+    return schema_editor.quote_name('%s_email_lower' % table), table, \
+        User._meta.get_field('email').column
+
+
+def create_email_index(apps, schema_editor):
+    # EmailBackend matches on LOWER(email). MySQL compares case-insensitively
+    # anyway and doesn't support expression indexes.
+    connection = schema_editor.connection
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    # Migrations run within a transaction, so PostgreSQL locks the user
+    # table against writes while the index is built. On large tables, build
+    # the index by hand before migrating, which makes this a no-op (shown
+    # for the default user model):
+    #
+    #   CREATE INDEX CONCURRENTLY auth_user_email_lower
+    #   ON auth_user (LOWER(email));
+    index_name, table, column = get_index_details(apps, schema_editor)
+    schema_editor.execute("CREATE INDEX IF NOT EXISTS %s ON %s (LOWER(%s))" % (
+        index_name, schema_editor.quote_name(table),
+        schema_editor.quote_name(column)))
+
+
+def drop_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    index_name, _, _ = get_index_details(apps, schema_editor)
+    schema_editor.execute("DROP INDEX IF EXISTS %s" % index_name)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('customer', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
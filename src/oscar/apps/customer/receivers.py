@@ -0,0 +1,47 @@
+from django.contrib.auth.models import Group, Permission
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from oscar.apps.customer import user_cache
+from oscar.core.compat import get_user_model
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate_user(instance.pk)
+
+
+def invalidate_cached_user_relations(sender, instance, reverse, **kwargs):
+    if kwargs['action'] not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        # A group or permission was added to or removed from users
+        user_cache.invalidate_all()
+    else:
+        user_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_cached_users(sender, **kwargs):
+    # Only m2m_changed passes an action; invalidate after the change
+    if kwargs.get('action', 'post_').startswith('post_'):
+        user_cache.invalidate_all()
+
+
+for field_name in ('groups', 'user_permissions'):
+    try:
+        field = User._meta.get_field(field_name)
+    except FieldDoesNotExist:
+        # Custom user models don't need to use PermissionsMixin
+        continue
+    m2m_changed.connect(
+        invalidate_cached_user_relations, sender=field.rel.through,
+        dispatch_uid='oscar-user-cache-%s' % field_name)
@@ -0,0 +1,140 @@
+"""
+Throttling of login attempts.
+
+Every attempt to authenticate with EmailBackend consumes a token from a
+bucket for the email address and, if the request is passed to authenticate,
+one for the client's IP address. Buckets refill continuously. Attempts are
+rejected while a bucket is empty, before any query or password hashing.
+
+Django's login view and AuthenticationForm don't pass the request to
+authenticate, so attempts are only throttled per IP address if the login
+view uses oscar.apps.customer.forms.EmailAuthenticationForm (or otherwise
+calls authenticate with request=request).
+
+Throttling is enabled by setting OSCAR_LOGIN_THROTTLE_STORE to the dotted
+path of a store class. InMemoryThrottleStore keeps buckets per process,
+CacheThrottleStore shares them between processes through Django's cache.
+"""
+import collections
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from oscar.core.loading import import_string
+
+_throttle = (None, None)
+
+
+def take_token(bucket, capacity, period, now):
+    """
+    Refill a bucket of (tokens, last update) and try to take a token from
+    it. Returns whether a token was taken and the updated bucket.
+    """
+    tokens, updated = bucket
+    tokens = min(capacity, tokens + (now - updated) * capacity / period)
+    if tokens >= 1:
+        return True, (tokens - 1, now)
+    return False, (tokens, now)
+
+
+class InMemoryThrottleStore(object):
+    """
+    Keeps token buckets in the memory of the current process.
+
+    The least recently used buckets are dropped once there are more than
+    max_keys of them.
+    """
+    max_keys = 100000
+
+    def __init__(self):
+        self._buckets = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key, capacity, period):
+        """
+        Take a token from the bucket for key, which holds up to capacity
+        tokens and is refilled completely within period seconds. Returns
+        whether a token was available.
+        """
+        now = time.time()
+        with self._lock:
+            # Re-insert the bucket to mark it as most recently used
+            allowed, self._buckets[key] = take_token(
+                self._buckets.pop(key, (capacity, now)), capacity, period,
+                now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed
+
+
+class CacheThrottleStore(object):
+    """
+    Keeps token buckets in a Django cache, so they are shared between
+    processes.
+
+    Updates aren't atomic, so concurrent attempts can occasionally both take
+    the last token. The cache is set with OSCAR_LOGIN_THROTTLE_CACHE.
+    """
+    key_prefix = 'oscar-login-throttle:'
+
+    def __init__(self):
+        self.cache = caches[getattr(
+            settings, 'OSCAR_LOGIN_THROTTLE_CACHE', 'default')]
+
+    def consume(self, key, capacity, period):
+        now = time.time()
+        # Keys contain user input, which can be too long or contain
+        # characters that cache backends like memcached reject
+        cache_key = self.key_prefix + hashlib.md5(
+            key.encode('utf-8')).hexdigest()
+        allowed, bucket = take_token(
+            self.cache.get(cache_key, (capacity, now)), capacity, period, now)
+        # A bucket that isn't used for a period is full again
+        self.cache.set(cache_key, bucket, period)
+        return allowed
+
+
+class LoginThrottle(object):
+    """
+    Applies the configured rates to login attempts
+    """
+
+    def __init__(self, store, rates):
+        self.store = store
+        self.rates = rates
+
+    def allow(self, email, request=None):
+        """
+        Whether an attempt to log in with the given (normalised) email
+        address is allowed
+        """
+        keys = [('email', email.lower())]
+        if request is not None and request.META.get('REMOTE_ADDR'):
+            keys.append(('ip', request.META['REMOTE_ADDR']))
+        for kind, value in keys:
+            if kind not in self.rates:
+                continue
+            capacity, period = self.rates[kind]
+            if not self.store.consume(
+                    '%s:%s' % (kind, value), capacity, float(period)):
+                return False
+        return True
+
+
+def get_login_throttle():
+    """
+    Return the configured login throttle, or None if throttling is disabled
+    """
+    global _throttle
+    store_path = getattr(settings, 'OSCAR_LOGIN_THROTTLE_STORE', None)
+    if store_path is None:
+        return None
+    rates = getattr(settings, 'OSCAR_LOGIN_THROTTLE_RATES', {})
+    config = (store_path, sorted(rates.items()))
+    if _throttle[0] != config:
+        _throttle = (
+            config, LoginThrottle(import_string(store_path)(), dict(rates)))
+    return _throttle[1]
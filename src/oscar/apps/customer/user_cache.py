@@ -0,0 +1,117 @@
+"""
+Cache of user instances and their permissions.
+
+EmailBackend.get_user is called on every request of a logged-in user. If
+OSCAR_USER_CACHE names one of the caches in the CACHES setting, users are
+loaded from that cache instead of the database. A local-memory cache keeps
+users per process, a shared cache (e.g. memcached) across processes.
+
+Cached users are invalidated with version keys: each user has one that is
+changed whenever the user or their permissions change, and there is a global
+one for changes to groups and permissions, which can affect many users.
+
+Changes are detected with the post_save, post_delete and m2m_changed signals
+(see receivers.py). QuerySet.update() and raw SQL don't send them, so users
+changed that way (e.g. deactivated, or given a new password) stay cached for
+up to OSCAR_USER_CACHE_TIMEOUT seconds. Code that changes users that way has
+to call invalidate_user or invalidate_users itself:
+
+    User.objects.filter(pk__in=user_ids).update(is_active=False)
+    user_cache.invalidate_users(user_ids)
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+ENTRY_KEY = 'oscar-user:%s'
+USER_VERSION_KEY = 'oscar-user-version:%s'
+PERMISSIONS_VERSION_KEY = 'oscar-user-version:permissions'
+
+
+def get_cache():
+    """
+    Return the cache users are stored in, or None if caching is disabled
+    """
+    alias = getattr(settings, 'OSCAR_USER_CACHE', None)
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+def get_timeout():
+    return getattr(settings, 'OSCAR_USER_CACHE_TIMEOUT', 300)
+
+
+def load_user(user_id, loader):
+    """
+    Return the user with the given ID from the cache. On a miss, the user is
+    loaded by calling loader with the ID and stored, including any
+    permissions that loader cached on the instance.
+
+    The versions are read before calling loader, so changes made while
+    loading the user invalidate the new entry.
+    """
+    cache = get_cache()
+    if cache is None:
+        return loader(user_id)
+    entry_key = ENTRY_KEY % user_id
+    version_key = USER_VERSION_KEY % user_id
+    values = cache.get_many(
+        [entry_key, version_key, PERMISSIONS_VERSION_KEY])
+    user_version = values.get(version_key)
+    permissions_version = values.get(PERMISSIONS_VERSION_KEY)
+    if entry_key in values:
+        entry_user_version, entry_permissions_version, user = \
+            values[entry_key]
+        # A missing version key is never valid, as we create them below
+        if (user_version is not None and
+                entry_user_version == user_version and
+                entry_permissions_version == permissions_version):
+            return user
+
+    user = loader(user_id)
+    if user is not None:
+        if user_version is None:
+            user_version = _bump(cache, version_key)
+        if permissions_version is None:
+            permissions_version = _bump(cache, PERMISSIONS_VERSION_KEY)
+        cache.set(entry_key, (user_version, permissions_version, user),
+                  get_timeout())
+    return user
+
+
+def invalidate_user(user_id):
+    """
+    Invalidate the cached user with the given ID
+    """
+    cache = get_cache()
+    if cache is not None:
+        _bump(cache, USER_VERSION_KEY % user_id)
+
+
+def invalidate_users(user_ids):
+    """
+    Invalidate the cached users with the given IDs, e.g. after updating
+    them with QuerySet.update()
+    """
+    cache = get_cache()
+    if cache is not None:
+        for user_id in user_ids:
+            _bump(cache, USER_VERSION_KEY % user_id)
+
+
+def invalidate_all():
+    """
+    Invalidate all cached users, e.g. after group permissions changed
+    """
+    cache = get_cache()
+    if cache is not None:
+        _bump(cache, PERMISSIONS_VERSION_KEY)
+
+
+def _bump(cache, key):
+    # Version keys need to outlive the entries they validate
+    version = uuid.uuid4().hex
+    cache.set(key, version, None)
+    return version
@@ -1,4 +1,8 @@
-from oscar.views.decorators import permissions_required
+from django.conf import settings
+from django.utils import six
+
+from oscar.core.metrics import time_decorated_view
+from oscar.views.decorators import freeze_permissions, permissions_required
 
 
 class Application(object):
@@ -22,6 +26,10 @@ class Application(object):
     #: Default permission for any view not in permissions_map
     default_permissions = None
 
+    #: Maps the names of the URL patterns decorated by post_process_urls to
+    #: their permissions. Useful for introspection.
+    url_permissions = None
+
     def __init__(self, app_name=None, **kwargs):
         self.app_name = app_name
         # Set all kwargs as object attributes
@@ -48,18 +56,65 @@ class Application(object):
             urlpatterns (list): A list of URL patterns
 
         """
-        for pattern in urlpatterns:
-            if hasattr(pattern, 'url_patterns'):
-                self.post_process_urls(pattern.url_patterns)
-            if not hasattr(pattern, '_callback'):
-                continue
-            # Look for a custom decorator
-            decorator = self.get_url_decorator(pattern)
-            if decorator:
-                # Nasty way of modifying a RegexURLPattern
-                pattern._callback = decorator(pattern._callback)
+        url_permissions = {}
+        # Walk the (nested) patterns without recursing
+        pending = [urlpatterns]
+        while pending:
+            for pattern in pending.pop():
+                if hasattr(pattern, 'url_patterns'):
+                    pending.append(pattern.url_patterns)
+                if not hasattr(pattern, '_callback'):
+                    continue
+                # Look for a custom decorator
+                decorator, permissions = self._get_cached_url_decorator(
+                    pattern)
+                if decorator:
+                    # Nasty way of modifying a RegexURLPattern
+                    pattern._callback = self.decorate_view(
+                        decorator, pattern._callback, pattern.name)
+                    url_permissions[pattern.name] = permissions
+        self.url_permissions = url_permissions
         return urlpatterns
 
+    def decorate_view(self, decorator, view, url_name):
+        """
+        Apply a URL decorator to a view.
+
+        If OSCAR_PERMISSION_TIMING is enabled, the time spent in the
+        decorator and in the view is recorded (see oscar.core.metrics).
+        """
+        if getattr(settings, 'OSCAR_PERMISSION_TIMING', False):
+            if self.name and url_name:
+                url_name = '%s:%s' % (self.name, url_name)
+            return time_decorated_view(decorator, view, url_name)
+        return decorator(view)
+
+    def _get_cached_url_decorator(self, pattern):
+        """
+        Return the decorator for the pattern and its permissions.
+
+        The decorators of the base get_url_decorator only depend on the
+        permissions, so they are cached per application class and
+        permissions. Overridden get_url_decorator methods can depend on
+        anything, so they are always called.
+        """
+        permissions = self.get_permissions(pattern.name)
+        cls = type(self)
+        if (six.get_unbound_function(cls.get_url_decorator) is not
+                six.get_unbound_function(Application.get_url_decorator)):
+            return self.get_url_decorator(pattern), permissions
+
+        cache = cls.__dict__.get('_url_decorator_cache')
+        if cache is None:
+            cache = {}
+            cls._url_decorator_cache = cache
+        key = freeze_permissions(permissions)
+        try:
+            decorator = cache[key]
+        except KeyError:
+            decorator = cache[key] = self.get_url_decorator(pattern)
+        return decorator, permissions
+
     def get_permissions(self, url):
         """
         Return a list of permissions for a given URL name
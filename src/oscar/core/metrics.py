@@ -0,0 +1,162 @@
+"""
+Timing of the permission checks and other decorators that Application wraps
+around views.
+
+If OSCAR_PERMISSION_TIMING is enabled, Application.post_process_urls
+instruments every decorated view to measure the time spent in the
+decorators separately from the time spent in the view itself. The
+PermissionTimingMiddleware passes these timings to the sink configured in
+OSCAR_METRICS_SINK, and the oscar_permission_timings management command
+prints a summary.
+"""
+import logging
+from functools import wraps
+from timeit import default_timer
+
+from django.conf import settings
+from django.core.cache import caches
+
+from oscar.core.loading import import_string
+
+logger = logging.getLogger('oscar.metrics')
+
+_sink = (None, None)
+
+
+def get_metrics_sink():
+    """
+    Return the (cached) instance of the configured metrics sink
+    """
+    global _sink
+    sink_path = getattr(settings, 'OSCAR_METRICS_SINK',
+                        'oscar.core.metrics.CacheMetricsSink')
+    if _sink[0] != sink_path:
+        _sink = (sink_path, import_string(sink_path)())
+    return _sink[1]
+
+
+def time_decorated_view(decorator, view, url_name):
+    """
+    Apply decorator to view, recording how long the decorator and the view
+    take. The timings are stored on the request.
+    """
+    @wraps(view)
+    def timed_view(request, *args, **kwargs):
+        start = default_timer()
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            request._oscar_view_time = default_timer() - start
+
+    decorated_view = decorator(timed_view)
+
+    @wraps(decorated_view)
+    def timed_decorated_view(request, *args, **kwargs):
+        request._oscar_view_time = 0
+        start = default_timer()
+        try:
+            return decorated_view(request, *args, **kwargs)
+        finally:
+            total_time = default_timer() - start
+            view_time = request._oscar_view_time
+            timings = getattr(request, 'oscar_view_timings', None)
+            if timings is None:
+                timings = request.oscar_view_timings = []
+            timings.append((url_name, total_time - view_time, view_time))
+
+    return timed_decorated_view
+
+
+class BaseMetricsSink(object):
+    """
+    Receives the permission and view timings of each request
+    """
+
+    def record(self, url_name, permission_time, view_time):
+        raise NotImplementedError
+
+    def get_summary(self):
+        """
+        Return a dictionary mapping URL names to tuples of the number of
+        requests, the total time spent in permission checks and the total
+        time spent in views.
+        """
+        return {}
+
+    def reset(self):
+        pass
+
+
+class InMemoryMetricsSink(BaseMetricsSink):
+    """
+    Aggregates timings in the memory of the current process
+    """
+
+    def __init__(self):
+        self.totals = {}
+
+    def record(self, url_name, permission_time, view_time):
+        count, total_permission_time, total_view_time = self.totals.get(
+            url_name, (0, 0.0, 0.0))
+        self.totals[url_name] = (count + 1,
+                                 total_permission_time + permission_time,
+                                 total_view_time + view_time)
+
+    def get_summary(self):
+        return dict(self.totals)
+
+    def reset(self):
+        self.totals = {}
+
+
+class CacheMetricsSink(BaseMetricsSink):
+    """
+    Aggregates timings in a Django cache, so the management command can read
+    them from another process. Use a shared cache for timings of all
+    processes. Updates aren't atomic, so concurrent requests can get lost.
+    """
+    key = 'oscar-metrics:permission-timings'
+
+    def __init__(self):
+        self.cache = caches[getattr(
+            settings, 'OSCAR_METRICS_CACHE', 'default')]
+
+    def record(self, url_name, permission_time, view_time):
+        totals = self.cache.get(self.key) or {}
+        count, total_permission_time, total_view_time = totals.get(
+            url_name, (0, 0.0, 0.0))
+        totals[url_name] = (count + 1,
+                            total_permission_time + permission_time,
+                            total_view_time + view_time)
+        self.cache.set(self.key, totals, None)
+
+    def get_summary(self):
+        return self.cache.get(self.key) or {}
+
+    def reset(self):
+        self.cache.delete(self.key)
+
+
+class LoggingMetricsSink(BaseMetricsSink):
+    """
+    Logs the timings of each request to the 'oscar.metrics' logger
+    """
+
+    def record(self, url_name, permission_time, view_time):
+        logger.info("%s: permissions %.2fms, view %.2fms", url_name,
+                    permission_time * 1000, view_time * 1000)
+
+
+class PermissionTimingMiddleware(object):
+    """
+    Passes the timings recorded for views instrumented by Application to the
+    configured metrics sink
+    """
+
+    def process_response(self, request, response):
+        timings = getattr(request, 'oscar_view_timings', None)
+        if timings:
+            sink = get_metrics_sink()
+            for url_name, permission_time, view_time in timings:
+                sink.record(url_name, permission_time, view_time)
+        return response
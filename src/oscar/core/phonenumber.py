@@ -26,7 +26,10 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 
-from django.utils import six
+import re
+from multiprocessing import Pool
+
+from django.utils import lru_cache, six
 
 from django.core import validators
 from django.conf import settings
@@ -36,6 +39,21 @@ from django.utils.encoding import python_2_unicode_compatible
 
 import phonenumbers
 
+# Matches phone numbers in E.164 format, the format they're stored in
+E164_REGEX = re.compile(r'^\+[1-9]\d{1,14}$')
+
+# Number of parsed (phone number, region) pairs to cache
+PARSE_CACHE_SIZE = 10000
+
+
+@lru_cache.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(phone_number, region):
+    # The cached instances are never handed out, only copied
+    number = phonenumbers.phonenumber.PhoneNumber()
+    phonenumbers.parse(number=phone_number, region=region,
+                       keep_raw_input=True, numobj=number)
+    return number
+
 
 @python_2_unicode_compatible
 class PhoneNumber(phonenumbers.phonenumber.PhoneNumber):
@@ -56,10 +74,22 @@ class PhoneNumber(phonenumbers.phonenumber.PhoneNumber):
         phone_number_obj = cls()
         if region is None:
             region = getattr(settings, 'PHONENUMBER_DEFAULT_REGION', None)
-        phonenumbers.parse(number=phone_number, region=region,
-                           keep_raw_input=True, numobj=phone_number_obj)
+        phone_number_obj.merge_from(_parse(phone_number, region))
         return phone_number_obj
 
+    def __setattr__(self, name, value):
+        # Validity and formatted representations depend on all attributes
+        self.__dict__.pop('_cache', None)
+        super(PhoneNumber, self).__setattr__(name, value)
+
+    def _get_cached(self, key, build):
+        cache = self.__dict__.setdefault('_cache', {})
+        try:
+            return cache[key]
+        except KeyError:
+            value = cache[key] = build()
+            return value
+
     def __str__(self):
         format_string = getattr(
             settings, 'PHONENUMBER_DEFAULT_FORMAT', 'INTERNATIONAL')
@@ -81,11 +111,13 @@ class PhoneNumber(phonenumbers.phonenumber.PhoneNumber):
         """
         checks whether the number supplied is actually valid
         """
-        return phonenumbers.is_valid_number(self)
+        return self._get_cached(
+            'valid', lambda: phonenumbers.is_valid_number(self))
 
     def format_as(self, format):
         if self.is_valid():
-            return phonenumbers.format_number(self, format)
+            return self._get_cached(
+                format, lambda: phonenumbers.format_number(self, format))
         else:
             return self.raw_input
 
@@ -133,3 +165,53 @@ def validate_international_phonenumber(value):
     phone_number = to_python(value)
     if phone_number and not phone_number.is_valid():
         raise ValidationError(_(u'The phone number entered is not valid.'))
+
+
+def _normalise(args):
+    value, region = args
+    if value in validators.EMPTY_VALUES:
+        return u'', True
+    try:
+        number = phonenumbers.parse(value, region)
+    except phonenumbers.NumberParseException:
+        return value, False
+    if phonenumbers.is_valid_number(number):
+        return phonenumbers.format_number(
+            number, phonenumbers.PhoneNumberFormat.E164), True
+    return value, False
+
+
+def normalise_many(values, default_region=None, processes=None, pool=None,
+                   pool_threshold=10000, chunksize=None):
+    """
+    Normalise many phone numbers at once.
+
+    Returns a list with the value PhoneNumberField would store for each of
+    the values (the E.164 format for valid numbers, the value itself for
+    invalid ones and '' for empty ones) and a list of whether each value
+    is valid.
+
+    Each distinct value is parsed only once. Values are parsed in pool if
+    one is passed, which lets callers reuse a pool for many batches.
+    Otherwise, if processes is set and there are at least pool_threshold
+    distinct values, they are parsed in a new pool of that many processes.
+    """
+    if default_region is None:
+        default_region = getattr(settings, 'PHONENUMBER_DEFAULT_REGION', None)
+    values = list(values)
+    distinct = list(set(values))
+    args = [(value, default_region) for value in distinct]
+    if pool is not None:
+        results = pool.map(_normalise, args, chunksize)
+    elif processes and len(distinct) >= pool_threshold:
+        pool = Pool(processes)
+        try:
+            results = pool.map(_normalise, args, chunksize)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [_normalise(arg) for arg in args]
+    normalised = dict(zip(distinct, results))
+    return ([normalised[value][0] for value in values],
+            [normalised[value][1] for value in values])
@@ -1,8 +1,11 @@
 from __future__ import absolute_import  # for logging import below
 import logging
+import re
 
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.shortcuts import redirect, resolve_url
-from django.utils import six
+from django.utils import lru_cache, six
 from django.utils.http import is_safe_url
 from django.utils.timezone import get_current_timezone, is_naive, make_aware
 from django.conf import settings
@@ -22,14 +25,21 @@ def default_slugifier(value):
     return django_slugify(value)
 
 
-def slugify(value):
+def _build_slugifier():
     """
-    Slugify a string (even if it contains non-ASCII chars)
+    Returns a function that applies the slug settings to a string.
+
+    The slug map and the blacklist are compiled into one regex each, and
+    results are cached for the OSCAR_SLUG_CACHE_SIZE most recent values.
     """
     # Re-map some strings to avoid important characters being stripped.  Eg
-    # remap 'c++' to 'cpp' otherwise it will become 'c'.
-    for k, v in settings.OSCAR_SLUG_MAP.items():
-        value = value.replace(k, v)
+    # remap 'c++' to 'cpp' otherwise it will become 'c'. Longer strings take
+    # precedence.
+    slug_map = dict(settings.OSCAR_SLUG_MAP)
+    map_regex = None
+    if slug_map:
+        map_regex = re.compile('|'.join(
+            re.escape(k) for k in sorted(slug_map, key=len, reverse=True)))
 
     # Allow an alternative slugify function to be specified
     # Recommended way to specify a function is as a string
@@ -37,16 +47,49 @@ def slugify(value):
     if isinstance(slugifier, six.string_types):
         slugifier = import_string(slugifier)
 
-    # Use unidecode to convert non-ASCII strings to ASCII equivalents where
-    # possible.
-    value = slugifier(unidecode(six.text_type(value)))
+    # Stopwords are removed together with a separator on either side
+    blacklist_regex = None
+    if settings.OSCAR_SLUG_BLACKLIST:
+        blacklist_regex = re.compile('|'.join(
+            '%s-|-%s' % (re.escape(word), re.escape(word))
+            for word in settings.OSCAR_SLUG_BLACKLIST))
+
+    @lru_cache.lru_cache(
+        maxsize=getattr(settings, 'OSCAR_SLUG_CACHE_SIZE', 10000))
+    def _slugify(value):
+        if map_regex is not None:
+            value = map_regex.sub(lambda m: slug_map[m.group(0)], value)
+
+        # Use unidecode to convert non-ASCII strings to ASCII equivalents
+        # where possible.
+        value = slugifier(unidecode(value))
+
+        if blacklist_regex is not None:
+            value = blacklist_regex.sub('', value)
+        return value
+
+    return _slugify
+
 
-    # Remove stopwords
-    for word in settings.OSCAR_SLUG_BLACKLIST:
-        value = value.replace(word + '-', '')
-        value = value.replace('-' + word, '')
+_slugifier = None
 
-    return value
+
+@receiver(setting_changed)
+def _reset_slugifier(setting, **kwargs):
+    global _slugifier
+    if setting in ('OSCAR_SLUG_MAP', 'OSCAR_SLUG_FUNCTION',
+                   'OSCAR_SLUG_BLACKLIST', 'OSCAR_SLUG_CACHE_SIZE'):
+        _slugifier = None
+
+
+def slugify(value):
+    """
+    Slugify a string (even if it contains non-ASCII chars)
+    """
+    global _slugifier
+    if _slugifier is None:
+        _slugifier = _build_slugifier()
+    return _slugifier(six.text_type(value))
 
 
 def compose(*functions):
@@ -23,6 +23,43 @@ OSCAR_UPLOAD_ROOT = '/tmp'
 # Address settings
 OSCAR_REQUIRED_ADDRESS_FIELDS = ('first_name', 'last_name', 'line1',
                                  'line4', 'postcode', 'country')
+OSCAR_ADDRESS_SEARCH_BACKEND = (
+    'oscar.apps.address.search_backends.SimpleSearchBackend')
+
+# Authentication
+# Maximum number of users sharing an email address whose password is checked
+# on login, most recently logged in first. None checks all of them.
+OSCAR_AUTH_MAX_CANDIDATES = None
+# Number of threads used to check the passwords of several candidates
+OSCAR_AUTH_HASH_WORKERS = 1
+# Maximum number of passwords hashed concurrently per process
+OSCAR_AUTH_MAX_CONCURRENT_HASHES = None
+# Name of the cache (see CACHES) in which logged-in users and their
+# permissions are cached between requests. None disables caching. Cached
+# users are invalidated by model signals, so changes made with
+# QuerySet.update() only apply after OSCAR_USER_CACHE_TIMEOUT unless
+# oscar.apps.customer.user_cache.invalidate_users is called.
+OSCAR_USER_CACHE = None
+OSCAR_USER_CACHE_TIMEOUT = 300
+# Dotted path of the store used to throttle login attempts, e.g.
+# 'oscar.apps.customer.throttling.InMemoryThrottleStore'. None disables
+# throttling.
+OSCAR_LOGIN_THROTTLE_STORE = None
+# Attempts allowed per email address and per IP address, as a tuple of
+# (attempts, seconds). IP addresses are only throttled if the login form
+# passes the request to authenticate(), like EmailAuthenticationForm does.
+OSCAR_LOGIN_THROTTLE_RATES = {
+    'email': (10, 60),
+    'ip': (100, 60),
+}
+OSCAR_LOGIN_THROTTLE_CACHE = 'default'
+
+# Permission timing
+# Record the time spent in permission checks of Application views. Requires
+# oscar.core.metrics.PermissionTimingMiddleware.
+OSCAR_PERMISSION_TIMING = False
+OSCAR_METRICS_SINK = 'oscar.core.metrics.CacheMetricsSink'
+OSCAR_METRICS_CACHE = 'default'
 
 # Product list settings
 OSCAR_PRODUCTS_PER_PAGE = 20
@@ -55,6 +92,8 @@ OSCAR_EAGER_ALERTS = True
 OSCAR_SLUG_FUNCTION = 'oscar.core.utils.default_slugifier'
 OSCAR_SLUG_MAP = {}
 OSCAR_SLUG_BLACKLIST = []
+# Number of recently slugified strings to cache
+OSCAR_SLUG_CACHE_SIZE = 10000
 
 # Menu structure of the dashboard navigation
 OSCAR_DASHBOARD_NAVIGATION = [
@@ -1,13 +1,65 @@
+import hashlib
 import re
+import uuid
+
 from django import forms
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.db.models.sql.datastructures import EmptyResultSet
+from django.dispatch import receiver
+from django.forms.models import ModelChoiceIterator
 from django.forms.utils import flatatt
-from django.utils import formats
+from django.utils import formats, lru_cache, six
 from django.utils.six.moves import map
 from django.utils.encoding import force_text
 from django.utils.html import format_html
 from django.utils.safestring import mark_safe
+from django.utils.translation import get_language
 
 
+def _compile_replacements(replacements):
+    """
+    Returns a function that applies the replacements in a single pass
+    """
+    regex = re.compile('|'.join(map(re.escape, replacements)))
+
+    def replace(text):
+        return regex.sub(lambda match: replacements[match.group(0)], text)
+    return replace
+
+
+_replace_js_time_format = _compile_replacements({
+    '%H': 'hh',
+    '%I': 'HH',
+    '%M': 'ii',
+    '%S': 'ss',
+})
+
+_replace_js_datetime_format = _compile_replacements({
+    '%Y': 'yyyy',
+    '%y': 'yy',
+    '%m': 'mm',
+    '%d': 'dd',
+    '%H': 'hh',
+    '%I': 'HH',
+    '%M': 'ii',
+    '%S': 'ss',
+})
+
+_replace_js_input_mask = _compile_replacements({
+    '%Y': 'y',
+    '%y': '99',
+    '%m': 'm',
+    '%d': 'd',
+    '%H': 'h',
+    '%I': 'h',
+    '%M': 's',
+    '%S': 's',
+})
+
+
+@lru_cache.lru_cache(maxsize=None)
 def datetime_format_to_js_date_format(format):
     """
     Convert a Python datetime format to a date format suitable for use with
@@ -17,6 +69,7 @@ def datetime_format_to_js_date_format(format):
     return datetime_format_to_js_datetime_format(format)
 
 
+@lru_cache.lru_cache(maxsize=None)
 def datetime_format_to_js_time_format(format):
     """
     Convert a Python datetime format to a time format suitable for use with the
@@ -26,61 +79,40 @@ def datetime_format_to_js_time_format(format):
         format = format.split()[1]
     except IndexError:
         pass
-    converted = format
-    replacements = {
-        '%H': 'hh',
-        '%I': 'HH',
-        '%M': 'ii',
-        '%S': 'ss',
-    }
-    for search, replace in replacements.items():
-        converted = converted.replace(search, replace)
-    return converted.strip()
+    return _replace_js_time_format(format).strip()
 
 
+@lru_cache.lru_cache(maxsize=None)
 def datetime_format_to_js_datetime_format(format):
     """
     Convert a Python datetime format to a time format suitable for use with
     the datetime picker we use, http://www.malot.fr/bootstrap-datetimepicker/.
     """
-    converted = format
-    replacements = {
-        '%Y': 'yyyy',
-        '%y': 'yy',
-        '%m': 'mm',
-        '%d': 'dd',
-        '%H': 'hh',
-        '%I': 'HH',
-        '%M': 'ii',
-        '%S': 'ss',
-    }
-    for search, replace in replacements.items():
-        converted = converted.replace(search, replace)
-
-    return converted.strip()
+    return _replace_js_datetime_format(format).strip()
 
 
+@lru_cache.lru_cache(maxsize=None)
 def datetime_format_to_js_input_mask(format):
-    # taken from
-    # http://stackoverflow.com/questions/15175142/how-can-i-do-multiple-substitutions-using-regex-in-python  # noqa
-    def multiple_replace(dict, text):
-        # Create a regular expression  from the dictionary keys
-        regex = re.compile("(%s)" % "|".join(map(re.escape, dict.keys())))
-
-        # For each match, look-up corresponding value in dictionary
-        return regex.sub(lambda mo: dict[mo.string[mo.start():mo.end()]], text)
-
-    replacements = {
-        '%Y': 'y',
-        '%y': '99',
-        '%m': 'm',
-        '%d': 'd',
-        '%H': 'h',
-        '%I': 'h',
-        '%M': 's',
-        '%S': 's',
-    }
-    return multiple_replace(replacements, format).strip()
+    return _replace_js_input_mask(format).strip()
+
+
+@lru_cache.lru_cache(maxsize=None)
+def _get_localized_format(format_key, language, use_l10n):
+    return force_text(formats.get_format(format_key, language, use_l10n)[0])
+
+
+@receiver(setting_changed)
+def _clear_localized_formats(**kwargs):
+    _get_localized_format.cache_clear()
+
+
+def get_localized_format(format_key):
+    """
+    Returns the first format of format_key (e.g. 'DATE_INPUT_FORMATS') for
+    the active language. Formats are cached per language.
+    """
+    return _get_localized_format(
+        format_key, get_language(), settings.USE_L10N)
 
 
 class DateTimeWidgetMixin(object):
@@ -90,10 +122,10 @@ class DateTimeWidgetMixin(object):
             # For django <= 1.6.5, see
             # https://code.djangoproject.com/ticket/21173
             if self.is_localized and not self.manual_format:
-                format = force_text(formats.get_format(self.format_key)[0])
+                format = get_localized_format(self.format_key)
         else:
             # For django >= 1.7
-            format = format or formats.get_format(self.format_key)[0]
+            format = format or get_localized_format(self.format_key)
 
         return format
 
@@ -229,3 +261,111 @@ class AdvancedSelect(forms.Select):
                            option_value,
                            selected_html,
                            force_text(option_label))
+
+
+def get_options_version(version_key):
+    """
+    Returns the current version of the options cached by
+    CachedOptionsSelect widgets with the given version key
+    """
+    version = cache.get(version_key)
+    if version is None:
+        version = bump_options_version(version_key)
+    return version
+
+
+def bump_options_version(version_key):
+    """
+    Invalidates the options cached by CachedOptionsSelect widgets with the
+    given version key, e.g. when the underlying objects change
+    """
+    version = uuid.uuid4().hex
+    cache.set(version_key, version, None)
+    return version
+
+
+class CachedOptionsSelect(AdvancedSelect):
+    """
+    AdvancedSelect that renders its options once and caches them in the
+    current process. Only the selected and disabled attributes are added
+    when the widget is rendered.
+
+    Rendered options are cached per cache_key, language and version. For
+    model choices, the queryset and the empty label are part of the key as
+    well. The version is stored in Django's cache under version_key, so
+    bump_options_version(version_key) invalidates the options in all
+    processes.
+    """
+    # Maps (key, language) to (version, rendered options)
+    _options = {}
+
+    def __init__(self, attrs=None, choices=(), disabled_values=(),
+                 cache_key=None, version_key=None):
+        self.cache_key = cache_key
+        self.version_key = version_key
+        super(CachedOptionsSelect, self).__init__(
+            attrs, choices, disabled_values)
+
+    def get_choices_key(self):
+        """
+        Returns the key of the choices, or None if they can't be cached
+        """
+        key = self.cache_key
+        if isinstance(self.choices, ModelChoiceIterator):
+            field = self.choices.field
+            try:
+                query = six.text_type(field.queryset.query).encode('utf-8')
+            except EmptyResultSet:
+                return None
+            key = '%s:%s:%s' % (key, hashlib.md5(query).hexdigest(),
+                                force_text(field.empty_label))
+        return key
+
+    def get_rendered_options(self):
+        """
+        Returns a list of (value, prefix, suffix) for the options, or None
+        if they can't be cached
+        """
+        choices_key = self.get_choices_key()
+        if choices_key is None:
+            return None
+        cache_key = (choices_key, get_language())
+        version = get_options_version(self.version_key)
+        cached = self._options.get(cache_key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        options = []
+        for option_value, option_label in self.choices:
+            if isinstance(option_label, (list, tuple)):
+                # Option groups aren't supported
+                return None
+            option_value = force_text(option_value)
+            options.append((
+                option_value,
+                format_html(u'<option value="{0}"', option_value),
+                format_html(u'>{0}</option>', force_text(option_label))))
+        self._options[cache_key] = (version, options)
+        return options
+
+    def render_options(self, choices, selected_choices):
+        options = None
+        if self.cache_key and self.version_key and not choices:
+            options = self.get_rendered_options()
+        if options is None:
+            return super(CachedOptionsSelect, self).render_options(
+                choices, selected_choices)
+
+        selected_choices = set(force_text(v) for v in selected_choices)
+        output = []
+        for option_value, prefix, suffix in options:
+            if option_value in self.disabled_values:
+                output.append(prefix + ' disabled="disabled"' + suffix)
+            elif option_value in selected_choices:
+                output.append(prefix + ' selected="selected"' + suffix)
+                if not self.allow_multiple_selected:
+                    # Only allow for a single selection.
+                    selected_choices.remove(option_value)
+            else:
+                output.append(prefix + suffix)
+        return '\n'.join(output)
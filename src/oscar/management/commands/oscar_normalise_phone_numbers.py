@@ -0,0 +1,71 @@
+from multiprocessing import Pool
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db.models import Case, CharField, Value, When
+
+from oscar.core.phonenumber import normalise_many
+from oscar.models.fields import PhoneNumberField
+
+
+class Command(BaseCommand):
+    help = ("Normalise the values of all phone number fields to the format "
+            "they're saved in, e.g. after importing legacy data")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', dest='chunk_size', type=int, default=1000,
+            help="Number of rows to read and update at once")
+        parser.add_argument(
+            '--processes', dest='processes', type=int, default=None,
+            help="Number of processes to parse phone numbers in")
+        parser.add_argument(
+            '--region', dest='region', default=None,
+            help="Region of numbers without a country code (defaults to "
+                 "PHONENUMBER_DEFAULT_REGION)")
+
+    def handle(self, *args, **options):
+        # One pool for all chunks, as forking is expensive
+        pool = Pool(options['processes']) if options['processes'] else None
+        try:
+            for model in apps.get_models():
+                for field in model._meta.concrete_fields:
+                    if isinstance(field, PhoneNumberField):
+                        self.normalise_field(model, field, pool, options)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    def normalise_field(self, model, field, pool, options):
+        queryset = model._default_manager.order_by('pk')
+        updated = invalid = 0
+        last_pk = None
+        while True:
+            chunk = queryset
+            if last_pk is not None:
+                chunk = chunk.filter(pk__gt=last_pk)
+            rows = list(chunk.values_list(
+                'pk', field.attname)[:options['chunk_size']])
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            normalised, valid = normalise_many(
+                (value for _, value in rows), options['region'],
+                pool=pool)
+            invalid += valid.count(False)
+            changes = [(pk, new_value) for (pk, value), new_value
+                       in zip(rows, normalised) if new_value != value]
+            if changes:
+                model._default_manager.filter(
+                    pk__in=[pk for pk, _ in changes]).update(**{
+                        field.attname: Case(
+                            *[When(pk=pk, then=Value(value))
+                              for pk, value in changes],
+                            output_field=CharField())})
+                updated += len(changes)
+
+        self.stdout.write("%s.%s.%s: updated %d, invalid %d" % (
+            model._meta.app_label, model._meta.object_name, field.name,
+            updated, invalid))
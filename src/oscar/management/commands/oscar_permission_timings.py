@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from oscar.core.metrics import get_metrics_sink
+
+
+class Command(BaseCommand):
+    help = ("Summarise the time spent in permission checks compared with "
+            "the views themselves, per URL name")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', dest='reset', action='store_true', default=False,
+            help="Reset the recorded timings after printing them")
+
+    def handle(self, *args, **options):
+        sink = get_metrics_sink()
+        summary = sink.get_summary()
+        if not summary:
+            self.stdout.write("No timings recorded")
+            return
+
+        self.stdout.write("%-50s %8s %14s %14s %8s" % (
+            "URL name", "Requests", "Permissions ms", "View ms", "Share"))
+        rows = sorted(summary.items(), key=lambda item: -item[1][1])
+        for url_name, (count, permission_time, view_time) in rows:
+            total_time = permission_time + view_time
+            self.stdout.write("%-50s %8d %14.3f %14.3f %7.1f%%" % (
+                url_name or '-', count,
+                permission_time * 1000 / count, view_time * 1000 / count,
+                100 * permission_time / total_time if total_time else 0))
+
+        if options['reset']:
+            sink.reset()
@@ -1,7 +1,6 @@
 
 from django.core.exceptions import ImproperlyConfigured
 from django.db.models.fields import CharField, DecimalField
-from django.db.models import SubfieldBase
 from django.utils import six
 from django.utils.translation import ugettext_lazy as _
 
@@ -82,24 +81,53 @@ class PositiveDecimalField(DecimalField):
         return super(PositiveDecimalField, self).formfield(min_value=0)
 
 
-class UppercaseCharField(six.with_metaclass(SubfieldBase, CharField)):
+class NormalisingDescriptor(object):
+    """
+    Normalises values with the field's normalise method when they are
+    assigned. A lighter replacement for the descriptor of SubfieldBase,
+    which runs the field's complete to_python.
+
+    Model.__init__ assigns the values of loaded rows, so this is also the
+    only conversion of values loaded from the database.
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.__dict__[self.field.attname]
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = self.field.normalise(value)
+
+
+class UppercaseCharField(CharField):
     """
     A simple subclass of ``django.db.models.fields.CharField`` that
     restricts all text to be uppercase.
 
-    Defined with the with_metaclass helper so that to_python is called
-    https://docs.djangoproject.com/en/1.6/howto/custom-model-fields/#the-subfieldbase-metaclass  # NOQA
+    Values are uppercased when assigned, which includes when a row is loaded
+    from the database.
     """
 
+    def contribute_to_class(self, cls, name, **kwargs):
+        super(UppercaseCharField, self).contribute_to_class(
+            cls, name, **kwargs)
+        setattr(cls, self.name, NormalisingDescriptor(self))
+
+    def normalise(self, value):
+        if isinstance(value, six.string_types):
+            return value.upper()
+        return value
+
     def to_python(self, value):
-        val = super(UppercaseCharField, self).to_python(value)
-        if isinstance(val, six.string_types):
-            return val.upper()
-        else:
-            return val
+        return self.normalise(
+            super(UppercaseCharField, self).to_python(value))
 
 
-class NullCharField(six.with_metaclass(SubfieldBase, CharField)):
+class NullCharField(CharField):
     """
     CharField that stores '' as None and returns None as ''
     Useful when using unique=True and forms. Implies null==blank==True.
@@ -118,9 +146,15 @@ class NullCharField(six.with_metaclass(SubfieldBase, CharField)):
         kwargs['null'] = kwargs['blank'] = True
         super(NullCharField, self).__init__(*args, **kwargs)
 
+    def contribute_to_class(self, cls, name, **kwargs):
+        super(NullCharField, self).contribute_to_class(cls, name, **kwargs)
+        setattr(cls, self.name, NormalisingDescriptor(self))
+
+    def normalise(self, value):
+        return value if value is not None else u''
+
     def to_python(self, value):
-        val = super(NullCharField, self).to_python(value)
-        return val if val is not None else u''
+        return self.normalise(super(NullCharField, self).to_python(value))
 
     def get_prep_value(self, value):
         prepped = super(NullCharField, self).get_prep_value(value)
@@ -136,12 +170,36 @@ class NullCharField(six.with_metaclass(SubfieldBase, CharField)):
         return name, path, args, kwargs
 
 
-class PhoneNumberField(six.with_metaclass(SubfieldBase, CharField)):
+class PhoneNumberDescriptor(object):
+    """
+    Stores the value of a PhoneNumberField as assigned (usually the string
+    loaded from the database) and only parses it when it's accessed.
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        attname = self.field.attname
+        value = instance.__dict__[attname]
+        if value is not None and not isinstance(
+                value, phonenumber.PhoneNumber):
+            value = instance.__dict__[attname] = self.field.to_python(value)
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+class PhoneNumberField(CharField):
     """
     An international phone number.
 
     * Validates a wide range of phone number formats
     * Displays it nicely formatted
+    * Parses values lazily, on first access
 
     Notes
     -----
@@ -167,10 +225,23 @@ class PhoneNumberField(six.with_metaclass(SubfieldBase, CharField)):
         kwargs['max_length'] = kwargs.get('max_length', 128)
         super(PhoneNumberField, self).__init__(*args, **kwargs)
 
+    def contribute_to_class(self, cls, name, **kwargs):
+        super(PhoneNumberField, self).contribute_to_class(cls, name, **kwargs)
+        setattr(cls, self.name, PhoneNumberDescriptor(self))
+
+    def pre_save(self, model_instance, add):
+        # Pass on the value as assigned, so a number that was loaded from the
+        # database and not accessed since isn't parsed just to be saved
+        return model_instance.__dict__.get(self.attname)
+
     def get_prep_value(self, value):
         """
         Returns field's value prepared for saving into a database.
         """
+        if (isinstance(value, six.string_types) and
+                phonenumber.E164_REGEX.match(value)):
+            # Already normalised
+            return value
         value = phonenumber.to_python(value)
         if value is None:
             return u''
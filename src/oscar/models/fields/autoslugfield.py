@@ -24,10 +24,14 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+import collections
+import functools
+import operator
 import re
+
 from django.utils import six
 
-from django.db.models import SlugField
+from django.db.models import Q, SlugField
 
 try:
     from django.utils.encoding import force_unicode  # NOQA
@@ -36,6 +40,41 @@ except ImportError:
 
 from oscar.core.utils import slugify
 
+# Compiled separator patterns, keyed by separator
+_separator_patterns = {}
+
+
+def get_separator_patterns(separator):
+    """
+    Returns the compiled patterns that match runs of separators and
+    separators at either end of a slug. '-' is always treated as a
+    separator.
+    """
+    try:
+        return _separator_patterns[separator]
+    except KeyError:
+        re_sep = '(?:-|%s)' % re.escape(separator)
+        patterns = (re.compile('%s+' % re_sep),
+                    re.compile(r'^%s+|%s+$' % (re_sep, re_sep)))
+        _separator_patterns[separator] = patterns
+        return patterns
+
+
+def normalise_slug(slug, max_length=None, separator=six.u('-'),
+                   uppercase=False):
+    """
+    Truncates slug to max_length, replaces runs of separators (including
+    '-') with a single separator, removes separators at either end and
+    optionally uppercases it.
+    """
+    if max_length is not None:
+        slug = slug[:max_length]
+    repeated, ends = get_separator_patterns(separator)
+    slug = ends.sub('', repeated.sub(separator, slug))
+    if uppercase:
+        slug = slug.upper()
+    return slug
+
 
 class AutoSlugField(SlugField):
     """ AutoSlugField
@@ -71,6 +110,7 @@ class AutoSlugField(SlugField):
         self.overwrite = kwargs.pop('overwrite', False)
         self.uppercase = kwargs.pop('uppercase', False)
         self.allow_duplicates = kwargs.pop('allow_duplicates', False)
+        self._separator_patterns = get_separator_patterns(self.separator)
         super(AutoSlugField, self).__init__(*args, **kwargs)
 
     def _slug_strip(self, value):
@@ -81,9 +121,8 @@ class AutoSlugField(SlugField):
         If an alternate separator is used, it will also replace any instances
         of the default '-' separator with the new separator.
         """
-        re_sep = '(?:-|%s)' % re.escape(self.separator)
-        value = re.sub('%s+' % re_sep, self.separator, value)
-        return re.sub(r'^%s+|%s+$' % (re_sep, re_sep), '', value)
+        repeated, ends = self._separator_patterns
+        return ends.sub('', repeated.sub(self.separator, value))
 
     def get_queryset(self, model_cls, slug_field):
         for field, model in model_cls._meta.get_fields_with_model():
@@ -96,70 +135,205 @@ class AutoSlugField(SlugField):
             return slugify(content)
         return ''
 
-    def create_slug(self, model_instance, add):  # NOQA (too complex)
-        # get fields to populate from and slug field to set
+    def build_slug(self, model_instance):
+        """
+        Returns the slug for model_instance without ensuring it is unique
+        """
+        # get fields to populate from
         if not isinstance(self._populate_from, (list, tuple)):
             self._populate_from = (self._populate_from, )
-        slug_field = model_instance._meta.get_field(self.attname)
 
-        # only set slug if empty and first-time save, or when overwrite=True
-        if add and not getattr(model_instance, self.attname) or self.overwrite:
-            # slugify the original field content and set next step to 2
-            def slug_for_field(field):
-                return self.slugify_func(getattr(model_instance, field))
-            slug = self.separator.join(map(slug_for_field, self._populate_from))  # NOQA
-            next = 2
-        else:
-            # get slug from the current model instance
-            slug = getattr(model_instance, self.attname)
-            # model_instance is being modified, and overwrite is False,
-            # so instead of doing anything, just return the current slug
-            return slug
+        # slugify the original field content
+        def slug_for_field(field):
+            return self.slugify_func(getattr(model_instance, field))
+        slug = self.separator.join(map(slug_for_field, self._populate_from))
 
         # strip slug depending on max_length attribute of the slug field
         # and clean-up
-        slug_len = slug_field.max_length
-        if slug_len:
-            slug = slug[:slug_len]
-        slug = self._slug_strip(slug)
+        return normalise_slug(
+            slug, self.max_length, self.separator, self.uppercase)
 
-        if self.uppercase:
-            slug = slug.upper()
+    def get_unique_together_kwargs(self, model_instance):
+        """
+        Returns the filter kwargs that implement any unique_together
+        constraints of the slug field
+        """
+        kwargs = {}
+        for params in model_instance._meta.unique_together:
+            if self.attname in params:
+                for param in params:
+                    if param == self.attname:
+                        continue
+                    field = model_instance._meta.get_field(param)
+                    kwargs[field.attname] = getattr(
+                        model_instance, field.attname, None)
+        return kwargs
+
+    def create_slug(self, model_instance, add):
+        # only set slug if empty and first-time save, or when overwrite=True
+        if not (add and not getattr(model_instance, self.attname) or
+                self.overwrite):
+            # model_instance is being modified, and overwrite is False,
+            # so instead of doing anything, just return the current slug
+            return getattr(model_instance, self.attname)
 
-        original_slug = slug
+        slug_field = model_instance._meta.get_field(self.attname)
+        original_slug = self.build_slug(model_instance)
 
         if self.allow_duplicates:
-            return slug
+            return original_slug
 
         # exclude the current model instance from the queryset used in finding
         # the next valid slug
         queryset = self.get_queryset(model_instance.__class__, slug_field)
         if model_instance.pk:
             queryset = queryset.exclude(pk=model_instance.pk)
+        queryset = queryset.filter(
+            **self.get_unique_together_kwargs(model_instance))
 
-        # form a kwarg dict used to impliment any unique_together contraints
-        kwargs = {}
-        for params in model_instance._meta.unique_together:
-            if self.attname in params:
-                for param in params:
-                    kwargs[param] = getattr(model_instance, param, None)
-        kwargs[self.attname] = slug
+        def fetch_existing(base):
+            return set(self.filter_slugs_for_base(queryset, base).values_list(
+                self.attname, flat=True))
 
+        return self.find_free_slug(
+            original_slug, slug_field.max_length, fetch_existing)
+
+    def _base_q(self, base):
+        return (Q(**{self.attname: base}) |
+                Q(**{'%s__startswith' % self.attname: base + self.separator}))
+
+    def filter_slugs_for_base(self, queryset, base):
+        """
+        Filters the queryset down to the rows whose slug is base or base
+        followed by the separator, i.e. all rows that can collide with base
+        or one of its numbered variants.
+        """
+        return queryset.filter(self._base_q(base))
+
+    def find_free_slug(self, original_slug, slug_len, fetch_existing):
+        """
+        Returns original_slug, or the first numbered variant of it that is
+        not taken.
+
+        fetch_existing is called with a base slug and must return the set of
+        taken slugs that are either the base or start with the base followed
+        by the separator. It is only called again if a numbered variant has
+        to be truncated to a shorter base.
+        """
+        return self._find_free_slug(
+            original_slug, slug_len, fetch_existing)[0]
+
+    def _find_free_slug(self, original_slug, slug_len, fetch_existing,
+                        next=2):
+        """
+        Like find_free_slug, but only tries numbered variants from next on.
+        Returns the slug and the number to continue with.
+        """
+        base = original_slug
+        existing = fetch_existing(base)
+        slug = original_slug
         # increases the number while searching for the next valid slug
         # depending on the given slug, clean-up
-        while not slug or queryset.filter(**kwargs):
+        while not slug or slug in existing:
             slug = original_slug
             end = '%s%s' % (self.separator, next)
             end_len = len(end)
             if slug_len and len(slug) + end_len > slug_len:
-                slug = slug[:slug_len - end_len]
-                slug = self._slug_strip(slug)
+                slug = normalise_slug(
+                    slug, slug_len - end_len, self.separator)
+            if slug != base:
+                # The truncated base isn't covered by the fetched slugs
+                base = slug
+                existing = fetch_existing(base)
             slug = '%s%s' % (slug, end)
-            kwargs[self.attname] = slug
             next += 1
-        return slug
+        return slug, next
+
+    def assign_bulk(self, instances, query_batch_size=100):
+        """
+        Assigns unique slugs to new instances, e.g. before passing them to
+        bulk_create.
+
+        Slugs are resolved against the database and against each other.
+        The existing slugs for up to query_batch_size distinct base slugs
+        are fetched per query, and instances that already have a slug keep
+        it (unless overwrite is set). Returns the list of instances.
+        """
+        instances = list(instances)
+        if not instances:
+            return instances
+        model_cls = instances[0].__class__
+        slug_field = model_cls._meta.get_field(self.attname)
+        slug_len = slug_field.max_length
+
+        # Taken slugs and the bases they've been fetched for, per
+        # combination of unique_together values
+        taken = collections.defaultdict(set)
+        fetched = collections.defaultdict(set)
+        filters = {}
+        pending = []
+        for instance in instances:
+            kwargs = self.get_unique_together_kwargs(instance)
+            group = tuple(sorted(kwargs.items()))
+            filters[group] = kwargs
+            slug = getattr(instance, self.attname)
+            if not slug or self.overwrite:
+                slug = self.build_slug(instance)
+                if not self.allow_duplicates:
+                    pending.append((instance, group, slug))
+                    continue
+                self._mark_assigned(instance, slug)
+            taken[group].add(slug)
+
+        def get_queryset(group):
+            return self.get_queryset(model_cls, slug_field).filter(
+                **filters[group])
+
+        bases = collections.defaultdict(set)
+        for instance, group, slug in pending:
+            bases[group].add(slug)
+        for group, group_bases in bases.items():
+            group_bases = sorted(group_bases)
+            for i in range(0, len(group_bases), query_batch_size):
+                chunk = group_bases[i:i + query_batch_size]
+                query = functools.reduce(
+                    operator.or_, map(self._base_q, chunk))
+                taken[group].update(get_queryset(group).filter(
+                    query).values_list(self.attname, flat=True))
+                fetched[group].update(chunk)
+
+        # The number to continue with per group and base, as all lower
+        # numbered variants are taken
+        next_numbers = {}
+        for instance, group, original_slug in pending:
+            def fetch_existing(base):
+                # Only truncated bases haven't been fetched yet
+                if base not in fetched[group]:
+                    taken[group].update(self.filter_slugs_for_base(
+                        get_queryset(group), base).values_list(
+                            self.attname, flat=True))
+                    fetched[group].add(base)
+                return taken[group]
+
+            key = (group, original_slug)
+            slug, next_numbers[key] = self._find_free_slug(
+                original_slug, slug_len, fetch_existing,
+                next_numbers.get(key, 2))
+            taken[group].add(slug)
+            self._mark_assigned(instance, slug)
+        return instances
+
+    def _mark_assigned(self, instance, slug):
+        setattr(instance, self.attname, force_unicode(slug))
+        # Stop pre_save from overwriting the slug again
+        instance.__dict__.setdefault('_assigned_slugs', set()).add(
+            self.attname)
 
     def pre_save(self, model_instance, add):
+        assigned = model_instance.__dict__.get('_assigned_slugs')
+        if assigned and self.attname in assigned:
+            assigned.discard(self.attname)
+            return getattr(model_instance, self.attname)
         value = force_unicode(self.create_slug(model_instance, add))
         setattr(model_instance, self.attname, value)
         return value
@@ -45,6 +45,9 @@ class SortAnchorNode(template.Node):
         request = context['request']
         get_vars = request.GET.copy()
         sort_field = get_vars.pop('sort', [None])[0]
+        # Cursors of keyset pagination are only valid for the current sort
+        # order, so changing it starts from the first page
+        get_vars.pop('cursor', None)
 
         icon = ''
         if sort_field == field:
@@ -1,3 +1,13 @@
+import datetime
+import json
+
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+CURSOR_SALT = 'oscar.views.keyset_paginate'
+
+
 def sort_queryset(queryset, request, allowed_sorts, default=None):
     """ Sorts the queryset by one of allowed_sorts based on parameters
     'sort' and 'dir' from request """
@@ -9,3 +19,152 @@ def sort_queryset(queryset, request, allowed_sorts, default=None):
     elif default:
         queryset = queryset.order_by(default)
     return queryset
+
+
+class KeysetPage(object):
+    """
+    A page of results of keyset_paginate, with opaque cursors for the
+    following and preceding pages (or None if there are none)
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder truncates datetimes and times to milliseconds, which
+    would make the keyset filter skip or repeat rows. Keep microseconds.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super(_CursorEncoder, self).default(o)
+
+
+class _CursorSerializer(object):
+    """
+    JSON serializer for django.core.signing that handles dates and decimals
+    without losing precision
+    """
+
+    def dumps(self, obj):
+        return json.dumps(
+            obj, cls=_CursorEncoder, separators=(',', ':')).encode(
+                'latin-1')
+
+    def loads(self, data):
+        return json.loads(data.decode('latin-1'))
+
+
+def _get_sort(request, allowed_sorts, default):
+    sort = request.GET.get('sort', None)
+    if sort in allowed_sorts:
+        return sort, request.GET.get('dir', 'asc') == 'desc'
+    if default:
+        return default.lstrip('-'), default.startswith('-')
+    return 'pk', False
+
+
+def _get_sort_value(obj, field):
+    for name in field.split('__'):
+        if obj is None:
+            break
+        obj = getattr(obj, name)
+    return obj
+
+
+def _encode_cursor(sort, descending, value, pk, direction):
+    return signing.dumps(
+        [sort, descending, value, pk, direction],
+        salt=CURSOR_SALT, serializer=_CursorSerializer, compress=True)
+
+
+def _decode_cursor(cursor, sort, descending):
+    try:
+        (cursor_sort, cursor_descending, value, pk,
+         direction) = signing.loads(
+            cursor, salt=CURSOR_SALT, serializer=_CursorSerializer)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+    # Cursors of a different sort order are meaningless
+    if (cursor_sort, cursor_descending) != (sort, descending):
+        return None
+    if direction not in ('next', 'prev'):
+        return None
+    return value, pk, direction
+
+
+def keyset_paginate(queryset, request, allowed_sorts, default=None,
+                    page_size=20):
+    """
+    Sorts the queryset like sort_queryset and returns the page selected by
+    the 'cursor' parameter of the request as a KeysetPage.
+
+    Unlike OFFSET pagination, the page is selected by filtering on the sort
+    field and the primary key of the last row of the preceding page, so deep
+    pages are as cheap as the first one if there's an index on the sort
+    field. The primary key breaks ties between equal sort values. Sort
+    fields should not be nullable, as rows with NULLs would be skipped.
+    """
+    sort, descending = _get_sort(request, allowed_sorts, default)
+    cursor = request.GET.get('cursor')
+    position = _decode_cursor(cursor, sort, descending) if cursor else None
+
+    fields = [sort] if sort == 'pk' else [sort, 'pk']
+    backwards = position is not None and position[2] == 'prev'
+    # Fetch the preceding page in reverse order and flip it afterwards
+    reverse = descending != backwards
+    queryset = queryset.order_by(
+        *[('-' if reverse else '') + field for field in fields])
+
+    if position is not None:
+        value, pk = position[:2]
+        lookup = 'lt' if reverse else 'gt'
+        if sort == 'pk':
+            queryset = queryset.filter(**{'pk__' + lookup: pk})
+        else:
+            queryset = queryset.filter(
+                Q(**{'%s__%s' % (sort, lookup): value}) |
+                Q(**{sort: value, 'pk__' + lookup: pk}))
+
+    object_list = list(queryset[:page_size + 1])
+    has_more = len(object_list) > page_size
+    object_list = object_list[:page_size]
+    if backwards:
+        object_list.reverse()
+
+    def make_cursor(obj, direction):
+        return _encode_cursor(
+            sort, descending, _get_sort_value(obj, sort), obj.pk, direction)
+
+    # Coming from a cursor, there's a page in the direction we came from
+    if backwards:
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, position is not None
+
+    next_cursor = previous_cursor = None
+    if object_list:
+        if has_next:
+            next_cursor = make_cursor(object_list[-1], 'next')
+        if has_previous:
+            previous_cursor = make_cursor(object_list[0], 'prev')
+    return KeysetPage(object_list, next_cursor, previous_cursor)
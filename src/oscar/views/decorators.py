@@ -4,6 +4,13 @@ from django.core.urlresolvers import reverse_lazy
 
 
 
+# Compiled permission predicates, keyed by the frozen permissions
+_predicates = {}
+# Decorators returned by permissions_required for the default login URL,
+# keyed by the frozen permissions
+_decorators = {}
+
+
 def check_permissions(user, permissions):
     """
     Permissions can be a list or a tuple of lists. If it is a tuple,
@@ -21,26 +28,93 @@ def check_permissions(user, permissions):
     - permissions_required((['is_staff',], ['partner.dashboard_access']))
       allows both staff users and users with the above permission
     """
-    def _check_one_permission_list(perms):
-        regular_permissions = [perm for perm in perms if '.' in perm]
-        conditions = [perm for perm in perms if '.' not in perm]
-        # always check for is_active if not checking for is_anonymous
-        if (conditions and
-                'is_anonymous' not in conditions and
-                'is_active' not in conditions):
-            conditions.append('is_active')
-        attributes = [getattr(user, perm) for perm in conditions]
-        # evaluates methods, explicitly casts properties to booleans
-        passes_conditions = all([
-            attr() if callable(attr) else bool(attr) for attr in attributes])
-        return passes_conditions and user.has_perms(regular_permissions)
+    return compile_permissions(permissions)(user)
+
+
+def compile_permissions(permissions):
+    """
+    Compile permissions (see check_permissions) into a predicate that takes
+    a user.
+
+    The outcome is cached on the user instance, which Django loads once per
+    request. Django permissions are checked against the user's prefetched
+    permission set first (see has_perms).
+    """
+    key = freeze_permissions(permissions)
+    try:
+        return _predicates[key]
+    except KeyError:
+        pass
 
+    if key is None:
+        def predicate(user):
+            return True
+    else:
+        checks = [_compile_permission_list(perms) for perms in key]
+
+        def predicate(user):
+            results = getattr(user, '_oscar_permission_results', None)
+            if results is None:
+                results = {}
+                setattr(user, '_oscar_permission_results', results)
+            try:
+                return results[key]
+            except KeyError:
+                outcome = results[key] = any(check(user) for check in checks)
+                return outcome
+
+    _predicates[key] = predicate
+    return predicate
+
+
+def freeze_permissions(permissions):
+    """
+    Turn permissions into a hashable tuple of permission tuples
+    """
     if not permissions:
-        return True
+        return None
     elif isinstance(permissions, list):
-        return _check_one_permission_list(permissions)
+        return (tuple(permissions),)
     else:
-        return any(_check_one_permission_list(perm) for perm in permissions)
+        return tuple(tuple(perms) for perms in permissions)
+
+
+def _compile_permission_list(perms):
+    regular_permissions = frozenset(perm for perm in perms if '.' in perm)
+    conditions = [perm for perm in perms if '.' not in perm]
+    # always check for is_active if not checking for is_anonymous
+    if (conditions and
+            'is_anonymous' not in conditions and
+            'is_active' not in conditions):
+        conditions.append('is_active')
+    conditions = tuple(conditions)
+
+    def check(user):
+        for condition in conditions:
+            attr = getattr(user, condition)
+            # evaluates methods, explicitly casts properties to booleans
+            if not (attr() if callable(attr) else attr):
+                return False
+        return not regular_permissions or has_perms(user, regular_permissions)
+
+    return check
+
+
+def has_perms(user, permissions):
+    """
+    Like user.has_perms, but first checks against the user's permission set,
+    which the auth backends fetch once and cache on the user. Permissions
+    missing from that set are checked with user.has_perms, as backends can
+    grant permissions through has_perm only.
+    """
+    if user.is_active and getattr(user, 'is_superuser', False):
+        return True
+    # Custom user models don't need to implement get_all_permissions
+    get_all_permissions = getattr(user, 'get_all_permissions', None)
+    if get_all_permissions is None:
+        return user.has_perms(permissions)
+    missing = permissions.difference(get_all_permissions())
+    return not missing or user.has_perms(missing)
 
 
 def permissions_required(permissions, login_url=None):
@@ -54,10 +128,19 @@ def permissions_required(permissions, login_url=None):
     message, analogous to Django's permission_required decorator.
     """
     if login_url is None:
-        login_url = reverse_lazy('customer:login')
+        # Share the decorator between views with the same permissions
+        key = freeze_permissions(permissions)
+        try:
+            return _decorators[key]
+        except KeyError:
+            decorator = _decorators[key] = permissions_required(
+                permissions, login_url=reverse_lazy('customer:login'))
+            return decorator
+
+    predicate = compile_permissions(permissions)
 
     def _check_permissions(user):
-        outcome = check_permissions(user, permissions)
+        outcome = predicate(user)
         if not outcome and user.is_authenticated():
             raise PermissionDenied
         else:
@@ -0,0 +1,55 @@
+import datetime
+
+from django.test import TestCase
+from django.test.client import RequestFactory
+from django.utils import timezone
+
+from oscar.core.compat import get_user_model
+from oscar.views import keyset_paginate
+
+User = get_user_model()
+
+
+class TestKeysetPagination(TestCase):
+
+    def setUp(self):
+        # The join dates only differ in microseconds
+        joined = timezone.now().replace(microsecond=0)
+        self.users = [
+            User.objects.create(
+                username='user%d' % i, email='user%d@example.com' % i,
+                date_joined=joined + datetime.timedelta(microseconds=i))
+            for i in range(10)]
+        self.factory = RequestFactory()
+
+    def paginate(self, params):
+        request = self.factory.get('/', params)
+        return keyset_paginate(
+            User.objects.all(), request, ['date_joined'], page_size=3)
+
+    def page_through(self, direction):
+        params = {'sort': 'date_joined', 'dir': direction}
+        pages = [self.paginate(params)]
+        while pages[-1].has_next:
+            self.assertLess(len(pages), 10)
+            params['cursor'] = pages[-1].next_cursor
+            pages.append(self.paginate(params))
+        return pages
+
+    def test_pages_through_all_rows_in_ascending_order(self):
+        pages = self.page_through('asc')
+        rows = [user.pk for page in pages for user in page]
+        self.assertEqual([user.pk for user in self.users], rows)
+
+    def test_pages_through_all_rows_in_descending_order(self):
+        pages = self.page_through('desc')
+        rows = [user.pk for page in pages for user in page]
+        self.assertEqual([user.pk for user in reversed(self.users)], rows)
+
+    def test_previous_cursor_returns_preceding_page(self):
+        pages = self.page_through('asc')
+        params = {'sort': 'date_joined', 'dir': 'asc',
+                  'cursor': pages[2].previous_cursor}
+        self.assertEqual(
+            [user.pk for user in pages[1]],
+            [user.pk for user in self.paginate(params)])